@@ -1,12 +1,14 @@
 #!/usr/bin/env python
 import os
+from types import MappingProxyType
+
 from pygoogledocs import (
     get_credentials,
     get_drive_service,
     get_docs_service,
     find_folder,
     create_folder,
-    find_file,
+    batch_lookup,
     copy_document,
     Document,
     find_or_create_folder
@@ -18,8 +20,9 @@ FOLDER_NAME = 'MCP_Shared'
 TEMPLATE_NAME = 'Inquiry Activity Template'
 NEW_DOCUMENT_NAME = 'Algebra Patterns Inquiry 1.2'
 
-# Template field values
-TEMPLATE_FIELDS = {
+# Template field values, frozen so the mapping can be reused across many
+# generated documents without rebuilding per call
+TEMPLATE_FIELDS = MappingProxyType({
     "{Lesson_num_name}": "Lesson 1.2: Exploring Patterns in Algebra",
     "{Directions}": "Work in groups to solve the following problems. Discuss your approach with your team members and be prepared to share your findings with the class.",
     "{Worksheet_contents}": """
@@ -66,12 +69,21 @@ TEMPLATE_FIELDS = {
 """,
     "{Grade}": "Grade 7",
     "{Unit}": "Unit 1: Patterns and Algebraic Thinking"
-}
+})
+
+# Per-placeholder formatting applied alongside the replacements
+TEMPLATE_FIELD_STYLES = MappingProxyType({
+    "{Lesson_num_name}": {"bold": True, "fontSize": 16},
+})
 
 # No answer key is needed
 
 def main():
-    # Authenticate using service account credentials
+    # Authenticate using service account credentials. The services are
+    # built sequentially: both share one memoized transport, and when no
+    # bundled discovery document is available each build() fetches the
+    # discovery JSON over that transport — httplib2.Http is not
+    # thread-safe, so concurrent builds would interleave on one socket.
     creds = get_credentials(SERVICE_ACCOUNT_FILE)
     drive_service = get_drive_service(creds)
     docs_service = get_docs_service(creds)
@@ -84,32 +96,48 @@ def main():
         main_folder_id = main_folder['id']
         print(f"Created main folder with ID: {main_folder_id}")
     
+    # The subfolder and template lookups are independent once the main folder
+    # is known, so run them in a single batched HTTP round-trip
+    lookups = batch_lookup(drive_service, {
+        'inquiry_folder': (
+            "mimeType='application/vnd.google-apps.folder' and "
+            f"name='Inquiry Activities' and trashed=false and '{main_folder_id}' in parents"
+        ),
+        'template': (
+            f"name='{TEMPLATE_NAME}' and trashed=false and '{main_folder_id}' in parents"
+        ),
+    })
+
     # Create or find the Inquiry Activities subfolder
-    inquiry_folder = find_or_create_folder(drive_service, "Inquiry Activities", main_folder_id)
-    inquiry_folder_id = inquiry_folder['id']
+    inquiry_matches = lookups['inquiry_folder']
+    if len(inquiry_matches) == 1:
+        inquiry_folder_id = inquiry_matches[0]['id']
+    else:
+        # No folder yet, or duplicates that need consolidating
+        inquiry_folder = find_or_create_folder(drive_service, "Inquiry Activities", main_folder_id)
+        inquiry_folder_id = inquiry_folder['id']
     print(f"Using Inquiry Activities folder with ID: {inquiry_folder_id}")
 
     # Check if a template document exists, if not create a blank one
-    template_id = find_file(drive_service, TEMPLATE_NAME, main_folder_id)
+    template_matches = lookups['template']
+    template_id = template_matches[0]['id'] if template_matches else None
     if not template_id:
         print(f"Template '{TEMPLATE_NAME}' not found. Creating a new template...")
         # Create a new blank document to serve as template
         file_metadata = {
             'name': TEMPLATE_NAME,
             'mimeType': 'application/vnd.google-apps.document',
-            'parents': [folder_id]
+            'parents': [main_folder_id]
         }
         file = drive_service.files().create(body=file_metadata, fields='id').execute()
         template_id = file['id']
         print(f"Created template document with ID: {template_id}")
-        
+
         # Initialize the Document object for the template
         template_doc = Document(docs_service, template_id)
-        
-        # Add a title to the template
-        template_doc.create_header("Inquiry Activity", level=1)
-        
-        # Add template placeholders
+
+        # Header plus placeholders, written in one batchUpdate round-trip
+        header_text = "Inquiry Activity\n"
         content = """
 {Lesson_num_name}
 
@@ -121,9 +149,22 @@ Directions:
 
 {Worksheet_contents}
 """
-        # Insert the template content
-        template_doc.insert_text({'index': 1}, content)
-        
+        template_doc.batch_update([
+            {
+                'insertText': {
+                    'location': {'index': 1},
+                    'text': header_text + content
+                }
+            },
+            {
+                'updateParagraphStyle': {
+                    'range': {'startIndex': 1, 'endIndex': 1 + len(header_text)},
+                    'paragraphStyle': {'namedStyleType': 'HEADING_1'},
+                    'fields': 'namedStyleType'
+                }
+            }
+        ])
+
         print("Template document initialized with placeholders.")
 
     # Create a copy of the template document in the Inquiry Activities folder
@@ -134,15 +175,9 @@ Directions:
     # Initialize the Document object
     document = Document(docs_service, new_document_id)
 
-    # Replace all the template placeholders
-    for placeholder, replacement in TEMPLATE_FIELDS.items():
-        if placeholder == "{Lesson_num_name}":
-            document.replace_text(placeholder, replacement, format_bold=True, format_size=16)
-        elif placeholder == "{Worksheet_contents}":
-            document.replace_text(placeholder, replacement)
-        else:
-            document.replace_text(placeholder, replacement)
-    
+    # Replace all the template placeholders in one batchUpdate round-trip
+    document.replace_text_many(TEMPLATE_FIELDS, styles=TEMPLATE_FIELD_STYLES)
+
     print(f'New document created with ID: {new_document_id}')
     print(f'Document saved to the "Inquiry Activities" folder ({inquiry_folder_id})')
     print('Note: These documents are only accessible to the service account.')
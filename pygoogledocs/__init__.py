@@ -4,16 +4,19 @@ PyGoogleDocs - A Python package for automating Google Docs for math worksheets.
 
 from .auth import get_credentials, get_drive_service, get_docs_service
 from .drive import (
-    find_folder, 
-    create_folder, 
-    find_file, 
+    find_folder,
+    create_folder,
+    find_file,
+    batch_lookup,
     delete_file, 
     rename_file, 
-    copy_document, 
+    copy_document,
+    copy_documents,
     move_file,
     find_or_create_folder
 )
-from .document import Document
+from .document import Document, apply_many, preview_substitute
+from .presets import BulletPreset
 from .markdown import MarkdownFormatter
 
 __version__ = "0.1.0"
@@ -26,11 +29,16 @@ __all__ = [
     'find_folder',
     'create_folder',
     'find_file',
+    'batch_lookup',
     'delete_file',
     'rename_file',
     'copy_document',
+    'copy_documents',
     'move_file',
     'find_or_create_folder',
     'Document',
+    'apply_many',
+    'preview_substitute',
+    'BulletPreset',
     'MarkdownFormatter',
 ]
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""
+Bundled API discovery documents.
+
+Shipping docs_v1.json / drive_v3.json here lets the service builders skip
+the discovery HTTPS fetch on cold start. Regenerate the files with
+tools/refresh_discovery.py when bumping API versions; when a file is
+absent the builders fall back to the network fetch.
+"""
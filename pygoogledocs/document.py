@@ -1,43 +1,244 @@
+import asyncio
+import copy
+import re
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+
+from .presets import BulletPreset
+from .retry import execute_with_retry
+
+# Named paragraph styles for header levels 1-6, frozen since it's read on
+# every create_header call
+_HEADING_STYLES = MappingProxyType({i: f'HEADING_{i}' for i in range(1, 7)})
+
+# Accepted bulletPreset values, for rejecting bad presets before they cost
+# a round-trip
+_VALID_BULLET_PRESETS = frozenset(preset.value for preset in BulletPreset)
+
+# Request templates for styles rebuilt on every worksheet/header call;
+# deep-copied and given a range (and, for headers, a level) per use
+_TITLE_STYLE_TEMPLATE = {
+    'updateParagraphStyle': {
+        'paragraphStyle': {
+            'namedStyleType': 'TITLE',
+            'alignment': 'CENTER'
+        },
+        'fields': 'namedStyleType,alignment'
+    }
+}
+
+_HEADING_STYLE_TEMPLATE = {
+    'updateParagraphStyle': {
+        'paragraphStyle': {
+            'namedStyleType': 'HEADING_1'
+        },
+        'fields': 'namedStyleType'
+    }
+}
+
+# Docs rejects very large batchUpdate bodies; request lists beyond this
+# size are split into sequential, order-preserving chunks
+_BATCH_UPDATE_CHUNK = 400
+
+# Partial-response mask for scans that only need the body structure; drops
+# styles, named ranges, revision metadata and suggestion state from the
+# transfer
+_BODY_FIELDS = 'body(content)'
+
+
+def _build_text_style(bold=False, italic=False, size=None, color=None):
+    """
+    Build the textStyle dict and matching fields mask for the given flags.
+
+    Common flag combinations (all-bold headers, plain sized text) are
+    memoized so repeated calls reuse the same objects; callers must treat
+    the returned style dict as read-only.
+
+    Args:
+        bold: Whether to set bold
+        italic: Whether to set italic
+        size: Point size for the text (optional)
+        color: Color for the text in RGB format (optional)
+
+    Returns:
+        tuple: (style dict, comma-separated fields string)
+    """
+    if color is None:
+        return _build_text_style_cached(bool(bold), bool(italic), size)
+
+    # Color dicts aren't hashable, so extend the cached base uncached
+    style, fields = _build_text_style_cached(bool(bold), bool(italic), size)
+    style = dict(style)
+    style['foregroundColor'] = {'color': color}
+    return style, f'{fields},foregroundColor' if fields else 'foregroundColor'
+
+
+@lru_cache(maxsize=None)
+def _build_text_style_cached(bold, italic, size):
+    style = {}
+    fields = []
+
+    if bold:
+        style['bold'] = True
+        fields.append('bold')
+
+    if italic:
+        style['italic'] = True
+        fields.append('italic')
+
+    if size:
+        style['fontSize'] = {'magnitude': size, 'unit': 'PT'}
+        fields.append('fontSize')
+
+    return style, ','.join(fields)
+
+
+def _descending_index_order(requests):
+    """
+    Order a batch of index-addressed requests from the end of the document
+    backwards. Writing backwards means earlier requests in the batch never
+    shift the indices targeted by later ones, so all positions can be
+    computed up front without re-fetching the document in between.
+
+    Args:
+        requests: List of request objects whose indices are independent
+
+    Returns:
+        list: The requests sorted by descending location/range index
+    """
+    def anchor(request):
+        body = next(iter(request.values()))
+        location = body.get('location')
+        if location is not None:
+            return location.get('index', 0)
+        range_ = body.get('range')
+        if range_ is not None:
+            return range_.get('startIndex', 0)
+        return 0
+
+    # Stable sort keeps an insert ahead of its matching style update,
+    # which shares the same start index.
+    return sorted(requests, key=anchor, reverse=True)
+
+
+@lru_cache(maxsize=64)
+def _substitution_pattern(placeholders):
+    """Compile one alternation matching any of the given placeholders."""
+    return re.compile('|'.join(re.escape(placeholder) for placeholder in placeholders))
+
+
+def preview_substitute(text, mapping):
+    """
+    Apply a replacement mapping to local text in one pass.
+
+    Mirrors what a replaceAllText batch does server-side, so callers can
+    render a filled template (or verify a replace_text_many payload)
+    without a network call. A single compiled alternation replaces every
+    placeholder in one scan instead of one str.replace pass per key;
+    longer placeholders take precedence when one is a prefix of another.
+
+    Args:
+        text: Template text containing placeholders
+        mapping: Dictionary of placeholder -> replacement
+
+    Returns:
+        str: The text with every placeholder replaced
+    """
+    if not mapping:
+        return text
+    pattern = _substitution_pattern(tuple(sorted(mapping, key=len, reverse=True)))
+    return pattern.sub(lambda match: mapping[match.group(0)], text)
+
+
 class Document:
-    # Google Docs API bullet preset constants
-    BULLET_DISC_CIRCLE_SQUARE = "BULLET_DISC_CIRCLE_SQUARE"
-    BULLET_DIAMONDX_ARROW3D_SQUARE = "BULLET_DIAMONDX_ARROW3D_SQUARE"
-    BULLET_CHECKBOX = "BULLET_CHECKBOX"
-    BULLET_ARROW_DIAMOND_DISC = "BULLET_ARROW_DIAMOND_DISC"
-    BULLET_STAR_CIRCLE_SQUARE = "BULLET_STAR_CIRCLE_SQUARE"
-    BULLET_ARROW3D_CIRCLE_SQUARE = "BULLET_ARROW3D_CIRCLE_SQUARE"
-    BULLET_LEFTTRIANGLE_DIAMOND_DISC = "BULLET_LEFTTRIANGLE_DIAMOND_DISC"
-    BULLET_DIAMONDX_HOLLOWDIAMOND_SQUARE = "BULLET_DIAMONDX_HOLLOWDIAMOND_SQUARE"
-    BULLET_DIAMOND_CIRCLE_SQUARE = "BULLET_DIAMOND_CIRCLE_SQUARE"
-    NUMBERED_DECIMAL_ALPHA_ROMAN = "NUMBERED_DECIMAL_ALPHA_ROMAN"
-    NUMBERED_DECIMAL_ALPHA_ROMAN_PARENS = "NUMBERED_DECIMAL_ALPHA_ROMAN_PARENS"
-    NUMBERED_DECIMAL_NESTED = "NUMBERED_DECIMAL_NESTED"
-    NUMBERED_UPPERALPHA_ALPHA_ROMAN = "NUMBERED_UPPERALPHA_ALPHA_ROMAN"
-    NUMBERED_UPPERROMAN_UPPERALPHA_DECIMAL = "NUMBERED_UPPERROMAN_UPPERALPHA_DECIMAL"
-    NUMBERED_ZERODECIMAL_ALPHA_ROMAN = "NUMBERED_ZERODECIMAL_ALPHA_ROMAN"
+    # Bullet preset constants live in BulletPreset; the historical
+    # BULLET_*/NUMBERED_* class attribute names are kept as aliases
+    BulletPreset = BulletPreset
+    BULLET_DISC_CIRCLE_SQUARE = BulletPreset.DISC_CIRCLE_SQUARE
+    BULLET_DIAMONDX_ARROW3D_SQUARE = BulletPreset.DIAMONDX_ARROW3D_SQUARE
+    BULLET_CHECKBOX = BulletPreset.CHECKBOX
+    BULLET_ARROW_DIAMOND_DISC = BulletPreset.ARROW_DIAMOND_DISC
+    BULLET_STAR_CIRCLE_SQUARE = BulletPreset.STAR_CIRCLE_SQUARE
+    BULLET_ARROW3D_CIRCLE_SQUARE = BulletPreset.ARROW3D_CIRCLE_SQUARE
+    BULLET_LEFTTRIANGLE_DIAMOND_DISC = BulletPreset.LEFTTRIANGLE_DIAMOND_DISC
+    BULLET_DIAMONDX_HOLLOWDIAMOND_SQUARE = BulletPreset.DIAMONDX_HOLLOWDIAMOND_SQUARE
+    BULLET_DIAMOND_CIRCLE_SQUARE = BulletPreset.DIAMOND_CIRCLE_SQUARE
+    NUMBERED_DECIMAL_ALPHA_ROMAN = BulletPreset.NUMBERED_DECIMAL_ALPHA_ROMAN
+    NUMBERED_DECIMAL_ALPHA_ROMAN_PARENS = BulletPreset.NUMBERED_DECIMAL_ALPHA_ROMAN_PARENS
+    NUMBERED_DECIMAL_NESTED = BulletPreset.NUMBERED_DECIMAL_NESTED
+    NUMBERED_UPPERALPHA_ALPHA_ROMAN = BulletPreset.NUMBERED_UPPERALPHA_ALPHA_ROMAN
+    NUMBERED_UPPERROMAN_UPPERALPHA_DECIMAL = BulletPreset.NUMBERED_UPPERROMAN_UPPERALPHA_DECIMAL
+    NUMBERED_ZERODECIMAL_ALPHA_ROMAN = BulletPreset.NUMBERED_ZERODECIMAL_ALPHA_ROMAN
     
     def __init__(self, docs_service, document_id):
         self.docs_service = docs_service
         self.document_id = document_id
         self.last_index = None  # Track the last insertion point
+        self._revision_id = None  # Last known revision, refreshed on fetch
+        self._tab_ids = None  # Tab IDs never change, so they're fetched once
+        self._cached_doc = None  # Full document JSON, invalidated on mutation
+        self._pending = None  # Request queue while inside a batch() block
 
-    def fetch(self, include_tabs_content=True):
+    def _execute(self, request):
         """
-        Fetch and return the document's full JSON structure.
-        
+        Execute a request over a transport that is safe for this thread.
+
+        The service's shared httplib2 transport is not thread-safe, so the
+        threaded helpers (async_batch_update, replace_many, apply_many)
+        must not execute over it concurrently. Off the main thread this
+        resolves the service's credentials and routes the call through a
+        per-thread transport; on the main thread, or when no credentials
+        are attached to the service, the shared transport is used as
+        before.
+        """
+        http = None
+        if threading.current_thread() is not threading.main_thread():
+            creds = getattr(getattr(self.docs_service, '_http', None), 'credentials', None)
+            if creds is not None:
+                from .auth import thread_authorized_http
+                http = thread_authorized_http(creds)
+        return execute_with_retry(request, http=http)
+
+    def fetch(self, include_tabs_content=True, fields=None, refresh=False):
+        """
+        Fetch and return the document's JSON structure.
+
+        Full fetches are cached on the instance and served locally until a
+        batch_update invalidates the cache, so repeated reads between
+        mutations cost one GET. Partial fetches (a fields mask or
+        include_tabs_content=False) bypass the cache.
+
         Args:
             include_tabs_content: Whether to include content from all tabs in the response
-            
+            fields: Optional partial-response mask limiting the subtree
+                returned (e.g. 'body.content,revisionId'); by default the
+                full document is returned
+            refresh: Whether to bypass the cached document and re-pull
+
         Returns:
             dict: The document's JSON structure
         """
-        doc = self.docs_service.documents().get(
+        cacheable = fields is None and include_tabs_content
+        if cacheable and not refresh and self._cached_doc is not None:
+            return self._cached_doc
+
+        doc = self._execute(self.docs_service.documents().get(
             documentId=self.document_id,
-            includeTabsContent=include_tabs_content
-        ).execute()
+            includeTabsContent=include_tabs_content,
+            fields=fields
+        ))
+        if cacheable:
+            self._cached_doc = doc
         
         # Update last_index based on document content
         if include_tabs_content and 'tabs' in doc and doc['tabs']:
+            self._tab_ids = [
+                tab['tabProperties']['tabId']
+                for tab in doc['tabs']
+                if 'tabProperties' in tab
+            ]
             tab = doc['tabs'][0]  # Get first tab
             if 'documentTab' in tab and 'body' in tab['documentTab']:
                 body = tab['documentTab']['body']
@@ -46,48 +247,344 @@ class Document:
                     last_element = body['content'][-1]
                     self.last_index = last_element.get('endIndex', 1)
         
+        self._revision_id = doc.get('revisionId', self._revision_id)
+        
         return doc
 
-    def batch_update(self, requests):
+    @classmethod
+    def fetch_many(cls, docs_service, document_ids, fields=None):
+        """
+        Fetch several documents in a single batched HTTP round-trip.
+
+        Up to 100 GETs are multiplexed through the API's multipart batch
+        endpoint, so reading N documents costs one round-trip instead of N.
+
+        Args:
+            docs_service: Google Docs API service instance
+            document_ids: Iterable of document IDs to fetch
+            fields: Optional partial-response mask applied to every GET
+
+        Returns:
+            dict: Mapping of document ID to its JSON structure
+        """
+        results = {}
+
+        def _callback(request_id, response, exception):
+            if exception is not None:
+                raise exception
+            results[request_id] = response
+
+        batch = docs_service.new_batch_http_request(callback=_callback)
+        for document_id in document_ids:
+            batch.add(
+                docs_service.documents().get(
+                    documentId=document_id,
+                    fields=fields
+                ),
+                request_id=document_id
+            )
+        batch.execute()
+
+        return results
+
+    def get_revision_id(self, refresh=False):
+        """
+        Return the document's current revision ID.
+
+        Fetches only the revisionId field (a tiny response) when the value
+        isn't already known from a previous fetch; callers can use it to
+        decide whether a cached document structure is still current.
+
+        Args:
+            refresh: Whether to re-fetch even if a revision ID is cached
+
+        Returns:
+            str: The revision ID
+        """
+        if refresh or self._revision_id is None:
+            doc = self._execute(self.docs_service.documents().get(
+                documentId=self.document_id,
+                fields='revisionId'
+            ))
+            self._revision_id = doc.get('revisionId')
+        return self._revision_id
+
+    def _ensure_tab_ids(self):
+        """
+        Return the document's tab IDs, fetching them at most once.
+
+        Tab IDs are stable for the lifetime of a document, so a targeted
+        fields-masked GET on first use is enough; the cache is dropped only
+        when a batch contains a createTab request.
+
+        Returns:
+            list: The tab IDs in document order
+
+        Raises:
+            ValueError: If the document has no tabs
+        """
+        if self._tab_ids is None:
+            doc = self._execute(self.docs_service.documents().get(
+                documentId=self.document_id,
+                includeTabsContent=False,
+                fields='tabs(tabProperties(tabId))'
+            ))
+            self._tab_ids = [
+                tab['tabProperties']['tabId']
+                for tab in doc.get('tabs', [])
+                if 'tabProperties' in tab
+            ]
+        if not self._tab_ids:
+            raise ValueError("Document has no tabs")
+        return self._tab_ids
+
+    def get_first_tab_id(self):
+        """
+        Return the document's first tab ID.
+
+        Reads from the instance cache when available; otherwise performs
+        one fields-masked GET instead of fetching the whole document
+        just to learn the tab ID.
+
+        Returns:
+            str: The first tab's ID
+
+        Raises:
+            ValueError: If the document has no tabs
+        """
+        return self._ensure_tab_ids()[0]
+
+    def _fetch_body(self):
+        """
+        Return document JSON containing at least body.content.
+
+        Serves the cached full document when one is available; otherwise
+        pulls only the body structure with a fields mask, which is a
+        fraction of the full payload on large documents.
+        """
+        if self._cached_doc is not None:
+            return self._cached_doc
+        return self.fetch(fields=_BODY_FIELDS)
+
+    @contextmanager
+    def batch(self):
+        """
+        Buffer all batch_update calls inside the block into one HTTP request.
+
+        While the block is active every mutator queues its requests instead
+        of hitting the network; on exit the accumulated requests ship as a
+        single batchUpdate. Requests within a batch are applied in order, so
+        the high-level methods compose unchanged. Queued batch_update calls
+        return None since there is no per-call response. If the block
+        raises, the queued requests are discarded — nothing reaches the
+        server — and the tracked end index is dropped since the queuing
+        already advanced it.
+
+        Example:
+            with document.batch():
+                document.create_header("Results")
+                document.append_text("See below.")
+        """
+        if self._pending is not None:
+            # Nested use keeps extending the outer batch
+            yield self
+            return
+        self._pending = []
+        try:
+            yield self
+        except BaseException:
+            # Shipping a half-built batch on failure would apply a partial
+            # edit (and a flush error here would mask the original one);
+            # drop the queue and the now-wrong tracked index instead
+            self._pending = None
+            self.last_index = None
+            raise
+        pending, self._pending = self._pending, None
+        if pending:
+            # Queuing already advanced the tracked index; rewind it so the
+            # flush's own accounting doesn't apply the same delta twice
+            delta = self._request_index_delta(pending)
+            if delta is not None and self.last_index is not None:
+                self.last_index -= delta
+            self.batch_update(pending)
+
+    def batch_update(self, requests, refresh=False):
         """
         Execute a batchUpdate request on the document.
-        
+
+        Inside a batch() block the requests are queued for the single
+        flush instead of being sent, and None is returned. Request lists
+        larger than the API's practical per-call limit are split into
+        sequential ordered chunks and their replies merged.
+
         Args:
             requests: List of request objects to execute
-            
+            refresh: Whether to re-fetch the document afterwards; by default
+                the tracked end index is advanced locally from the request
+                list, and a fetch only happens when a request's effect on
+                indices can't be computed client-side
+
         Returns:
-            dict: The response from the API
+            dict: The response from the API, or None while batching
         """
-        body = {'requests': requests}
-        response = self.docs_service.documents().batchUpdate(
-            documentId=self.document_id,
-            body=body
-        ).execute()
-        
-        # After a batch update, refresh document to update last_index
-        self.fetch()
-        
+        if self._pending is not None:
+            self._pending.extend(requests)
+            # Queued requests still move indices once the batch flushes,
+            # so the tracked end index must advance now — otherwise every
+            # index-computing mutator in the block would target the same
+            # stale position. An index-opaque request drops the tracked
+            # value; get_end_index refuses to guess past it.
+            if not self._advance_last_index(requests):
+                self.last_index = None
+            return None
+
+        if len(requests) > _BATCH_UPDATE_CHUNK:
+            response = self._batch_update_chunked(requests)
+        else:
+            response = self._execute(self.docs_service.documents().batchUpdate(
+                documentId=self.document_id,
+                body={'requests': requests}
+            ))
+
+        if any('createTab' in request for request in requests):
+            self._tab_ids = None
+
+        # Any successful mutation makes the cached document stale
+        self._cached_doc = None
+
+        if refresh or not self._advance_last_index(requests):
+            self.fetch()
+
         return response
+
+    def _batch_update_chunked(self, requests):
+        """
+        Send an oversized request list as sequential ordered chunks.
+
+        Order is preserved across chunks — Docs applies requests in order
+        and later indices depend on earlier insertions — and the per-chunk
+        replies are merged so callers see one response.
+        """
+        replies = []
+        response = {}
+        for start in range(0, len(requests), _BATCH_UPDATE_CHUNK):
+            response = self._execute(self.docs_service.documents().batchUpdate(
+                documentId=self.document_id,
+                body={'requests': requests[start:start + _BATCH_UPDATE_CHUNK]}
+            ))
+            replies.extend(response.get('replies', []))
+
+        merged = dict(response)
+        merged['replies'] = replies
+        return merged
+
+    def _advance_last_index(self, requests):
+        """
+        Advance the tracked end index from the request list alone.
+
+        Returns False when the batch contains a request whose effect on
+        indices is opaque (e.g. replaceAllText or insertTable), signalling
+        that a real fetch is required.
+        """
+        delta = self._request_index_delta(requests)
+        if delta is None:
+            return False
+        if self.last_index is not None:
+            self.last_index += delta
+        return True
+
+    @staticmethod
+    def _request_index_delta(requests):
+        """
+        Return the net index growth of a request list, or None if opaque.
+
+        insertText grows the document by the text length,
+        insertInlineImage by one index, and insertPageBreak by two (the
+        break plus the newline inserted after it); style updates don't
+        move indices at all. A request whose effect can't be computed
+        client-side (e.g. replaceAllText or insertTable) makes the whole
+        list opaque.
+        """
+        _NEUTRAL_KINDS = (
+            'updateTextStyle', 'updateParagraphStyle', 'updateDocumentStyle',
+            'createParagraphBullets', 'deleteParagraphBullets'
+        )
+
+        delta = 0
+        for request in requests:
+            if 'insertText' in request:
+                delta += len(request['insertText'].get('text', ''))
+            elif 'insertInlineImage' in request:
+                delta += 1
+            elif 'insertPageBreak' in request:
+                # A page break is inserted followed by a newline
+                delta += 2
+            elif any(kind in request for kind in _NEUTRAL_KINDS):
+                continue
+            else:
+                return None
+        return delta
         
     def get_end_index(self, tab_id=None):
         """
         Get the current end index of the document or specified tab.
-        If document hasn't been fetched yet, fetch it first.
-        
+
+        The value is maintained locally by batch_update's request
+        accounting, so this is a pure attribute read except on first use
+        with an existing document, where only the index metadata is
+        fetched — not the full document body.
+
         Args:
             tab_id: Optional ID of the tab to get end index for
-            
+
         Returns:
             int: The end index position
+
+        Raises:
+            ValueError: If called inside a batch() block after a queued
+                request whose index effect can't be computed locally — the
+                server hasn't seen the pending requests, so no accurate
+                index exists until the batch flushes
         """
         if self.last_index is None:
-            self.fetch()
-            
+            if self._pending:
+                # The server hasn't applied the queued requests, so its
+                # end index must be corrected by their net growth; when
+                # that growth is opaque there is no accurate answer
+                delta = self._request_index_delta(self._pending)
+                if delta is None:
+                    raise ValueError(
+                        "Cannot compute an end index inside batch() after an "
+                        "index-opaque request; flush the batch first"
+                    )
+                self._fetch_end_index()
+                if self.last_index is not None:
+                    self.last_index += delta
+            else:
+                self._fetch_end_index()
+
         # If still None after fetching, default to index 1
         if self.last_index is None:
             self.last_index = 1
-            
+
         return self.last_index
+
+    def _fetch_end_index(self):
+        """Seed last_index with a GET that transfers only index metadata."""
+        doc = self._execute(self.docs_service.documents().get(
+            documentId=self.document_id,
+            includeTabsContent=True,
+            fields='body(content(endIndex)),tabs(documentTab(body(content(endIndex))))'
+        ))
+
+        if 'tabs' in doc and doc['tabs']:
+            body = doc['tabs'][0].get('documentTab', {}).get('body', {})
+        else:
+            body = doc.get('body', {})
+
+        content = body.get('content')
+        if content:
+            self.last_index = content[-1].get('endIndex', 1)
         
     def append_text(self, tab_id, text, format_bold=False, format_italic=False, format_size=None, format_color=None):
         """
@@ -120,28 +617,22 @@ class Document:
     def insert_markdown(self, tab_id, index, markdown_text):
         """
         Insert text with markdown formatting at the specified location.
-        
+
         Args:
-            tab_id: ID of the tab to insert into
+            tab_id: ID of the tab to insert into, or None to let the API
+                target the document's only tab — this skips the lookup
+                round-trip entirely for single-tab documents
             index: Position in the document to insert the text
             markdown_text: Text with markdown formatting to insert
-            
+
         Returns:
             dict: Response from the API
         """
         from .markdown import MarkdownFormatter
-        
+
         formatter = MarkdownFormatter()
-        requests = formatter.convert_to_doc_requests(markdown_text, index)
-        
-        # Add tab ID to all requests that have a location or range
-        for request in requests:
-            for key in request:
-                if 'location' in request[key]:
-                    request[key]['location']['tabId'] = tab_id
-                if 'range' in request[key]:
-                    request[key]['range']['tabId'] = tab_id
-        
+        requests = formatter.to_batch_requests(tab_id, index, markdown_text)
+
         return self.batch_update(requests)
 
     def replace_text(self, placeholder, replacement, format_bold=False, format_italic=False, format_size=None, format_color=None):
@@ -159,10 +650,8 @@ class Document:
         Returns:
             dict: Response from the API
         """
-        # Find all instances of the placeholder
-        doc = self.fetch()
-        
-        # Build replacement request
+        # replaceAllText is index-free, so no document fetch is needed to
+        # issue the replacement itself
         requests = [
             {
                 'replaceAllText': {
@@ -174,67 +663,217 @@ class Document:
                 }
             }
         ]
-        
-        response = self.batch_update(requests)
-        
-        # If we need to update formatting and text was replaced
-        if response.get('replies') and (format_bold or format_italic or format_size or format_color):
-            # Get all the locations where text was replaced
-            for reply in response.get('replies', []):
-                if 'replaceAllText' in reply:
-                    replace_info = reply['replaceAllText']
-                    if replace_info.get('occurrencesChanged', 0) > 0:
-                        # For each location, apply formatting
-                        self._apply_formatting_to_replaced_text(doc, placeholder, replacement, 
-                                                               format_bold, format_italic, 
-                                                               format_size, format_color)
-        
-        return response
+
+        style, fields = _build_text_style(format_bold, format_italic, format_size, format_color)
+        if fields:
+            # Formatting needs real ranges, which replaceAllText doesn't
+            # return. Locate the occurrences up front in the fetched document,
+            # then send the style updates in the same batch as the replace —
+            # requests in one batchUpdate apply in order, so the replacement
+            # text already exists when the styles are applied.
+            doc = self._fetch_body()
+            occurrences = self._find_placeholder_occurrences(doc, {placeholder: replacement})
+
+            # Each replacement shifts every later index by the length
+            # difference, so walk occurrences in document order with a
+            # running delta.
+            delta = 0
+            for start_index, _ in occurrences:
+                new_start = start_index + delta
+                delta += len(replacement) - len(placeholder)
+                requests.append({
+                    'updateTextStyle': {
+                        'range': {
+                            'startIndex': new_start,
+                            'endIndex': new_start + len(replacement)
+                        },
+                        'textStyle': style,
+                        'fields': fields
+                    }
+                })
+
+        return self.batch_update(requests)
     
-    def _apply_formatting_to_replaced_text(self, doc, placeholder, replacement, 
-                                           format_bold, format_italic, format_size, format_color):
-        """Apply formatting to the newly inserted text."""
-        # We need to search the document again to find the ranges of the replaced text
-        content = doc.get('body', {}).get('content', [])
-        format_requests = []
-        
-        # Build the formatting request
-        style = {}
-        update_fields = []
-        
-        if format_bold:
-            style['bold'] = True
-            update_fields.append('bold')
-        
-        if format_italic:
-            style['italic'] = True
-            update_fields.append('italic')
-        
-        if format_size:
-            style['fontSize'] = {'magnitude': format_size, 'unit': 'PT'}
-            update_fields.append('fontSize')
-        
-        if format_color:
-            style['foregroundColor'] = {'color': format_color}
-            update_fields.append('foregroundColor')
-        
-        if update_fields:
-            # Find all instances where the text was just replaced
-            # This is an approximation since we can't directly get the locations
-            # Use search API to find the locations precisely in a real implementation
-            format_requests.append({
-                'updateTextStyle': {
-                    'range': {
-                        'segmentId': '',  # Use the "name-only" segment for the main document
-                        'startIndex': 1,  # Placeholder, would be determined from actual API response
-                        'endIndex': len(replacement) + 1  # Placeholder
+    async def async_batch_update(self, requests, refresh=False):
+        """
+        Run batch_update without blocking the event loop.
+
+        The synchronous googleapiclient call is pushed onto a worker thread
+        via asyncio.to_thread, so several independent documents can be
+        updated concurrently with asyncio.gather. Each worker thread
+        executes over its own authorized transport (see _execute), since
+        the service's shared httplib2 transport is not thread-safe.
+
+        Args:
+            requests: List of request objects to execute
+            refresh: Whether to re-fetch the document afterwards
+
+        Returns:
+            dict: The response from the API
+        """
+        return await asyncio.to_thread(self.batch_update, requests, refresh)
+
+    # Alias kept so call sites can use either name for the threaded wrapper
+    batch_update_async = async_batch_update
+
+    async def replace_many(self, mapping, max_concurrency=5, **format_kwargs):
+        """
+        Fan out replace_text calls concurrently.
+
+        For plain same-document replacements prefer replace_text_many, which
+        does the whole job in one batchUpdate; this coroutine is for
+        workloads where each replacement genuinely needs its own call (e.g.
+        per-placeholder formatting flags). Concurrency is capped with a
+        semaphore to stay under the Docs API per-user rate limit.
+
+        Args:
+            mapping (dict): Mapping of placeholder text to replacement text
+            max_concurrency (int): Maximum in-flight requests
+            **format_kwargs: Formatting keywords forwarded to replace_text
+
+        Returns:
+            list: Responses from the API, in mapping order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _replace(placeholder, replacement):
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self.replace_text, placeholder, replacement, **format_kwargs
+                )
+
+        return await asyncio.gather(*(
+            _replace(placeholder, replacement)
+            for placeholder, replacement in mapping.items()
+        ))
+
+    def replace_text_many(self, mapping, styles=None):
+        """
+        Replace multiple placeholders in a single batchUpdate call.
+
+        Args:
+            mapping (dict): Mapping of placeholder text to replacement text
+            styles (dict): Optional mapping of placeholder to a style dict with
+                any of the keys 'bold', 'italic', 'fontSize', 'color' to apply
+                to the replaced text (optional)
+
+        Returns:
+            dict: Response from the API
+        """
+        requests = [
+            {
+                'replaceAllText': {
+                    'containsText': {
+                        'text': placeholder,
+                        'matchCase': True
                     },
-                    'textStyle': style,
-                    'fields': ','.join(update_fields)
+                    'replaceText': replacement
                 }
-            })
-            
-            self.batch_update(format_requests)
+            }
+            for placeholder, replacement in mapping.items()
+        ]
+
+        # If any placeholder needs formatting, locate its occurrences up front
+        # so the style updates can ride in the same batch as the replacements.
+        if styles:
+            doc = self._fetch_body()
+            occurrences = self._find_placeholder_occurrences(doc, mapping)
+
+            # Replacements shift every later index by the length difference,
+            # so walk occurrences in document order with a running delta.
+            delta = 0
+            for start_index, placeholder in occurrences:
+                replacement = mapping[placeholder]
+                new_start = start_index + delta
+                delta += len(replacement) - len(placeholder)
+
+                style_spec = styles.get(placeholder)
+                if not style_spec:
+                    continue
+
+                style, fields = _build_text_style(
+                    style_spec.get('bold'),
+                    style_spec.get('italic'),
+                    style_spec.get('fontSize'),
+                    style_spec.get('color')
+                )
+
+                if fields:
+                    requests.append({
+                        'updateTextStyle': {
+                            'range': {
+                                'startIndex': new_start,
+                                'endIndex': new_start + len(replacement)
+                            },
+                            'textStyle': style,
+                            'fields': fields
+                        }
+                    })
+
+        return self.batch_update(requests)
+
+    @classmethod
+    def _iter_text_runs(cls, doc):
+        """
+        Yield (start_index, text) for each text run in the document body.
+
+        A generator keeps the scan incremental — callers touch one run at a
+        time instead of materializing intermediate lists of the whole
+        document's runs. Recurses into table cells so placeholders inside
+        tables are found too. Fetches made with includeTabsContent=True
+        (the shape fetch() caches) carry the content under
+        tabs[0].documentTab.body rather than the top-level body, so that
+        shape is read as well.
+
+        Args:
+            doc: The fetched document JSON
+
+        Yields:
+            tuple: (start_index, text) per textRun, in document order
+        """
+        body = doc.get('body')
+        if body is None and doc.get('tabs'):
+            body = doc['tabs'][0].get('documentTab', {}).get('body', {})
+        yield from cls._iter_content_text_runs((body or {}).get('content', []))
+
+    @classmethod
+    def _iter_content_text_runs(cls, content):
+        """Recursively yield (start_index, text) from a content list."""
+        for element in content:
+            paragraph = element.get('paragraph')
+            if paragraph:
+                for part in paragraph.get('elements', []):
+                    text_run = part.get('textRun')
+                    if text_run:
+                        yield part.get('startIndex', 0), text_run.get('content', '')
+                continue
+            table = element.get('table')
+            if table:
+                for row in table.get('tableRows', []):
+                    for cell in row.get('tableCells', []):
+                        yield from cls._iter_content_text_runs(cell.get('content', []))
+
+    def _find_placeholder_occurrences(self, doc, mapping):
+        """
+        Scan the document body for occurrences of the given placeholders.
+
+        Args:
+            doc: The fetched document JSON
+            mapping (dict): Mapping whose keys are the placeholders to locate
+
+        Returns:
+            list: (start_index, placeholder) tuples sorted by document position
+        """
+        occurrences = []
+        for run_start, text in self._iter_text_runs(doc):
+            for placeholder in mapping:
+                offset = text.find(placeholder)
+                while offset != -1:
+                    occurrences.append((run_start + offset, placeholder))
+                    offset = text.find(placeholder, offset + 1)
+
+        occurrences.sort(key=lambda occ: occ[0])
+        return occurrences
 
     def insert_text(self, location, text, format_bold=False, format_italic=False, format_size=None, format_color=None):
         """
@@ -260,53 +899,28 @@ class Document:
                 }
             }
         ]
-        
-        response = self.batch_update(requests)
-        
+
         # Determine the range of the inserted text
         start_index = location.get('index', 0)
         end_index = start_index + len(text)
-        
-        # Apply formatting if needed
-        if format_bold or format_italic or format_size or format_color:
-            format_requests = []
-            
-            # Build the formatting request
-            style = {}
-            update_fields = []
-            
-            if format_bold:
-                style['bold'] = True
-                update_fields.append('bold')
-            
-            if format_italic:
-                style['italic'] = True
-                update_fields.append('italic')
-            
-            if format_size:
-                style['fontSize'] = {'magnitude': format_size, 'unit': 'PT'}
-                update_fields.append('fontSize')
-            
-            if format_color:
-                style['foregroundColor'] = {'color': format_color}
-                update_fields.append('foregroundColor')
-            
-            if update_fields:
-                format_requests.append({
-                    'updateTextStyle': {
-                        'range': {
-                            'segmentId': '',  # Use the "name-only" segment for the main document
-                            'startIndex': start_index,
-                            'endIndex': end_index
-                        },
-                        'textStyle': style,
-                        'fields': ','.join(update_fields)
-                    }
-                })
-                
-                self.batch_update(format_requests)
-        
-        return response
+
+        # Apply formatting in the same batch if needed; requests within one
+        # batchUpdate are applied in order, so the range is already valid
+        style, fields = _build_text_style(format_bold, format_italic, format_size, format_color)
+        if fields:
+            requests.append({
+                'updateTextStyle': {
+                    'range': {
+                        'segmentId': '',  # Use the "name-only" segment for the main document
+                        'startIndex': start_index,
+                        'endIndex': end_index
+                    },
+                    'textStyle': style,
+                    'fields': fields
+                }
+            })
+
+        return self.batch_update(requests)
 
     def create_header(self, text, level=1):
         """
@@ -319,16 +933,10 @@ class Document:
         Returns:
             dict: Response from the API
         """
-        doc = self.fetch()
-        
-        # Find the end of the document
-        content = doc.get('body', {}).get('content', [])
-        if content:
-            last_element = content[-1]
-            end_index = last_element.get('endIndex', 0)
-        else:
-            end_index = 1
-        
+        # The tracked end index makes this a pure attribute read except on
+        # first use, so no full-document fetch is needed
+        end_index = self.get_end_index()
+
         # Insert the header text
         insert_request = {
             'insertText': {
@@ -339,42 +947,18 @@ class Document:
             }
         }
         
-        # Apply header formatting
-        style_requests = []
-        
-        if level == 1:
-            style_name = 'HEADING_1'
-        elif level == 2:
-            style_name = 'HEADING_2'
-        elif level == 3:
-            style_name = 'HEADING_3'
-        elif level == 4:
-            style_name = 'HEADING_4'
-        elif level == 5:
-            style_name = 'HEADING_5'
-        elif level == 6:
-            style_name = 'HEADING_6'
-        else:
-            style_name = 'HEADING_1'  # Default to H1 if invalid level
-        
-        style_request = {
-            'updateParagraphStyle': {
-                'range': {
-                    'startIndex': end_index - 1,
-                    'endIndex': end_index + len(text)
-                },
-                'paragraphStyle': {
-                    'namedStyleType': style_name
-                },
-                'fields': 'namedStyleType'
-            }
+        # Apply header formatting, defaulting to H1 for invalid levels
+        style_request = copy.deepcopy(_HEADING_STYLE_TEMPLATE)
+        style_request['updateParagraphStyle']['paragraphStyle']['namedStyleType'] = (
+            _HEADING_STYLES.get(level, 'HEADING_1')
+        )
+        style_request['updateParagraphStyle']['range'] = {
+            'startIndex': end_index - 1,
+            'endIndex': end_index + len(text)
         }
-        
-        style_requests.append(style_request)
-        
-        # Execute requests
-        self.batch_update([insert_request])
-        return self.batch_update(style_requests)
+
+        # Insert and style in one batch; requests apply in order
+        return self.batch_update([insert_request, style_request])
 
     def create_table(self, rows, cols, headers=None):
         """
@@ -388,16 +972,10 @@ class Document:
         Returns:
             dict: Response from the API
         """
-        doc = self.fetch()
-        
-        # Find the end of the document
-        content = doc.get('body', {}).get('content', [])
-        if content:
-            last_element = content[-1]
-            end_index = last_element.get('endIndex', 0)
-        else:
-            end_index = 1
-        
+        # The tracked end index makes this a pure attribute read except on
+        # first use, so no full-document fetch is needed
+        end_index = self.get_end_index()
+
         # Add a newline before the table if needed
         insert_newline = {
             'insertText': {
@@ -419,33 +997,33 @@ class Document:
             }
         }
         
-        # Insert the table
-        response = self.batch_update([insert_newline, create_table])
-        
-        # Add headers if provided
+        requests = [insert_newline, create_table]
+
+        # Header cells of a fresh empty table sit at deterministic offsets,
+        # so they can be populated in the same batch without reading the
+        # structure back: the API adds a newline before the table, putting
+        # the table at end_index + 1, the first cell's paragraph 3 indices
+        # after that, and each following cell 2 indices further on
         if headers and len(headers) <= cols:
-            table_start_index = end_index  # This is where our table starts
-            
-            # We'd need to get the new structure of the document to find exact cell locations
-            # This is a simplified approach and might need adjustment for the actual API
+            first_cell = end_index + 4
             header_requests = []
-            
-            for i, header in enumerate(headers):
+            for col, header in enumerate(headers):
+                cell_start = first_cell + 2 * col
                 header_requests.append({
                     'insertText': {
                         'location': {
-                            'index': table_start_index + (i * 2) + 2  # Approximate location
+                            'index': cell_start
                         },
                         'text': header
                     }
                 })
-                
+
                 # Make headers bold
                 header_requests.append({
                     'updateTextStyle': {
                         'range': {
-                            'startIndex': table_start_index + (i * 2) + 2,
-                            'endIndex': table_start_index + (i * 2) + 2 + len(header)
+                            'startIndex': cell_start,
+                            'endIndex': cell_start + len(header)
                         },
                         'textStyle': {
                             'bold': True
@@ -453,10 +1031,11 @@ class Document:
                         'fields': 'bold'
                     }
                 })
-            
-            self.batch_update(header_requests)
-        
-        return response
+
+            # Apply backwards so each insert leaves the earlier cells' indices intact
+            requests.extend(_descending_index_order(header_requests))
+
+        return self.batch_update(requests)
 
     def insert_image(self, uri, width=None, height=None):
         """
@@ -470,21 +1049,12 @@ class Document:
         Returns:
             dict: Response from the API
         """
-        doc = self.fetch()
-        
-        # Find the end of the document
-        content = doc.get('body', {}).get('content', [])
-        if content:
-            last_element = content[-1]
-            end_index = last_element.get('endIndex', 0)
-        else:
-            end_index = 1
-        
-        # Create the image insertion request
+        # endOfSegmentLocation lets the server resolve the append point, so
+        # no index needs to be known client-side at all
         insert_image = {
             'insertInlineImage': {
-                'location': {
-                    'index': end_index - 1
+                'endOfSegmentLocation': {
+                    'segmentId': ''
                 },
                 'uri': uri
             }
@@ -515,22 +1085,13 @@ class Document:
         Returns:
             dict: Response from the API
         """
-        doc = self.fetch()
-        
-        # Find the end of the document
-        content = doc.get('body', {}).get('content', [])
-        if content:
-            last_element = content[-1]
-            end_index = last_element.get('endIndex', 0)
-        else:
-            end_index = 1
-        
         # Unfortunately, Google Docs API doesn't directly support adding LaTeX equations
-        # As a workaround, we'll just insert the LaTeX code with a note
+        # As a workaround, we'll just insert the LaTeX code with a note; the
+        # server resolves the append point via endOfSegmentLocation
         insert_text = {
             'insertText': {
-                'location': {
-                    'index': end_index - 1
+                'endOfSegmentLocation': {
+                    'segmentId': ''
                 },
                 'text': f"[Math Equation: {latex}]\n"
             }
@@ -538,7 +1099,8 @@ class Document:
         
         return self.batch_update([insert_text])
 
-    def create_worksheet(self, title, problems, width=500, height=700):
+    def create_worksheet(self, title, problems, width=500, height=700, refresh_after=False,
+                         number_preset=BulletPreset.NUMBERED_DECIMAL_ALPHA_ROMAN):
         """
         Create a math worksheet with a title and a series of numbered problems.
         
@@ -547,21 +1109,25 @@ class Document:
             problems (list): List of problem statements
             width (int): Width of the page in points
             height (int): Height of the page in points
+            refresh_after (bool): Whether to re-fetch the full document after
+                the update; off by default since callers rarely need it
+            number_preset (str): Bullet preset used to number the problems
         
         Returns:
             dict: Response from the API
         """
-        # First fetch the document to get tab information
-        doc = self.fetch()
-        if 'tabs' not in doc or not doc['tabs']:
-            raise ValueError("Document has no tabs")
-            
-        tab_id = doc['tabs'][0]['tabProperties']['tabId']
-        
-        # We'll execute operations one at a time to ensure document state is always current
-        
-        # Set page size
-        self.batch_update([{
+        if number_preset not in _VALID_BULLET_PRESETS:
+            raise ValueError(f"Unknown bullet preset: {number_preset}")
+
+        # The cached tab ID supplies the target tab; every insertion position
+        # is computed locally with a cursor, because requests within a
+        # single batchUpdate are applied in order
+        tab_id = self.get_first_tab_id()
+
+        # Fixed-size request list — page size, three title requests, one
+        # insert covering every problem, plus the numbering request
+        requests = [None] * (4 + (2 if problems else 0))
+        requests[0] = {
             'updateDocumentStyle': {
                 'documentStyle': {
                     'pageSize': {
@@ -577,57 +1143,73 @@ class Document:
                 },
                 'fields': 'pageSize'
             }
-        }])
-        
-        # Start with minimal content to ensure there's a paragraph
-        response = self.batch_update([{
+        }
+
+        # Title, bold and styled as a centered TITLE paragraph
+        cursor = 1
+        title_text = title + '\n\n'
+        requests[1] = {
             'insertText': {
                 'location': {
-                    'index': 1,
+                    'index': cursor,
                     'tabId': tab_id
                 },
-                'text': '\n'
+                'text': title_text
             }
-        }])
-        
-        # Add title
-        self.append_text(
-            tab_id, 
-            title + '\n\n',
-            format_bold=True
-        )
-        
-        # Apply title style at the document beginning
-        # Get the length of the title for proper styling
-        title_length = len(title)
-        self.batch_update([{
-            'updateParagraphStyle': {
+        }
+        requests[2] = {
+            'updateTextStyle': {
                 'range': {
-                    'startIndex': 1,
-                    'endIndex': 1 + title_length,
+                    'startIndex': cursor,
+                    'endIndex': cursor + len(title),
                     'tabId': tab_id
                 },
-                'paragraphStyle': {
-                    'namedStyleType': 'TITLE',
-                    'alignment': 'CENTER'
+                'textStyle': {
+                    'bold': True
                 },
-                'fields': 'namedStyleType,alignment'
+                'fields': 'bold'
             }
-        }])
-        
-        # Add each problem one by one
-        for i, problem in enumerate(problems, 1):
-            problem_text = f"{i}. {problem}\n\n"
-            
-            # Append each problem to the end
-            self.append_text(tab_id, problem_text)
-            
-        # Refresh document state
-        self.fetch()
-        
-        return response
+        }
+        title_style = copy.deepcopy(_TITLE_STYLE_TEMPLATE)
+        title_style['updateParagraphStyle']['range'] = {
+            'startIndex': cursor,
+            'endIndex': cursor + len(title),
+            'tabId': tab_id
+        }
+        requests[3] = title_style
+        cursor += len(title_text)
 
-    def generate_answer_sheet(self, title, problems, answers):
+        # All problems ship as one insertText — a single joined string is
+        # one subrequest regardless of problem count — and numbering is
+        # applied server-side over the whole range, so it stays correct if
+        # problems are later inserted or removed
+        if problems:
+            problems_start = cursor
+            problems_text = ''.join(f"{problem}\n" for problem in problems)
+            requests[4] = {
+                'insertText': {
+                    'location': {
+                        'index': cursor,
+                        'tabId': tab_id
+                    },
+                    'text': problems_text
+                }
+            }
+            cursor += len(problems_text)
+            requests[5] = {
+                'createParagraphBullets': {
+                    'range': {
+                        'startIndex': problems_start,
+                        'endIndex': cursor,
+                        'tabId': tab_id
+                    },
+                    'bulletPreset': number_preset
+                }
+            }
+
+        return self.batch_update(requests, refresh=refresh_after)
+
+    def generate_answer_sheet(self, title, problems, answers, refresh_after=False):
         """
         Generate an answer sheet for a math worksheet.
         
@@ -635,65 +1217,256 @@ class Document:
             title (str): Title of the answer sheet
             problems (list): List of problem numbers or identifiers
             answers (list): List of answers corresponding to the problems
+            refresh_after (bool): Whether to re-fetch the full document after
+                the update; off by default since callers rarely need it
         
         Returns:
             dict: Response from the API
         """
         if len(problems) != len(answers):
             raise ValueError("Number of problems must match number of answers")
-        
-        # First fetch the document to get tab information
-        doc = self.fetch()
-        if 'tabs' not in doc or not doc['tabs']:
-            raise ValueError("Document has no tabs")
-            
-        tab_id = doc['tabs'][0]['tabProperties']['tabId']
-        
-        # We'll execute operations one by one to ensure document state is always current
-        
-        # Start with minimal content to ensure there's a paragraph
-        self.batch_update([{
+
+        # The cached tab ID supplies the target tab; all insertion positions
+        # are computed locally and the whole sheet ships in one batchUpdate
+        tab_id = self.get_first_tab_id()
+
+        # Title position, then the table's, computed up front so the whole
+        # fixed-size request list can be built as one literal
+        cursor = 1
+        title_text = title + '\n\n'
+        table_cursor = cursor + len(title_text)
+
+        title_style = copy.deepcopy(_TITLE_STYLE_TEMPLATE)
+        title_style['updateParagraphStyle']['range'] = {
+            'startIndex': cursor,
+            'endIndex': cursor + len(title),
+            'tabId': tab_id
+        }
+
+        # Tabular rows as plain text: header, separator, then one row per pair
+        rows = ["Problem\tAnswer\n", "-------\t-------\n"]
+        rows.extend(f"{problem}\t{answer}\n" for problem, answer in zip(problems, answers))
+        table_text = ''.join(rows)
+
+        requests = [
+            {
+                'insertText': {
+                    'location': {
+                        'index': cursor,
+                        'tabId': tab_id
+                    },
+                    'text': title_text
+                }
+            },
+            {
+                'updateTextStyle': {
+                    'range': {
+                        'startIndex': cursor,
+                        'endIndex': cursor + len(title),
+                        'tabId': tab_id
+                    },
+                    'textStyle': {
+                        'bold': True
+                    },
+                    'fields': 'bold'
+                }
+            },
+            title_style,
+            {
+                'insertText': {
+                    'location': {
+                        'index': table_cursor,
+                        'tabId': tab_id
+                    },
+                    'text': table_text
+                }
+            }
+        ]
+
+        return self.batch_update(requests, refresh=refresh_after)
+
+    def create_worksheet_with_answers(self, title, problems, answers, width=500, height=700,
+                                      refresh_after=False,
+                                      number_preset=BulletPreset.NUMBERED_DECIMAL_ALPHA_ROMAN):
+        """
+        Create a worksheet followed by its answer key in one batchUpdate.
+
+        The problems page, a page break, and the answer table all ship as
+        a single request list, so the combined sheet costs one round-trip
+        instead of separate create_worksheet and generate_answer_sheet
+        calls against two documents or two batches.
+
+        Args:
+            title (str): Title of the worksheet
+            problems (list): List of problem statements
+            answers (list): List of answers corresponding to the problems
+            width (int): Width of the page in points
+            height (int): Height of the page in points
+            refresh_after (bool): Whether to re-fetch the full document after
+                the update; off by default since callers rarely need it
+            number_preset (str): Bullet preset used to number the problems
+
+        Returns:
+            dict: Response from the API
+        """
+        if number_preset not in _VALID_BULLET_PRESETS:
+            raise ValueError(f"Unknown bullet preset: {number_preset}")
+        if len(problems) != len(answers):
+            raise ValueError("Number of problems must match number of answers")
+
+        # The cached tab ID supplies the target tab; every insertion
+        # position is computed locally with a cursor, because requests
+        # within a single batchUpdate are applied in order
+        tab_id = self.get_first_tab_id()
+
+        requests = [{
+            'updateDocumentStyle': {
+                'documentStyle': {
+                    'pageSize': {
+                        'width': {
+                            'magnitude': width,
+                            'unit': 'PT'
+                        },
+                        'height': {
+                            'magnitude': height,
+                            'unit': 'PT'
+                        }
+                    }
+                },
+                'fields': 'pageSize'
+            }
+        }]
+
+        # Title, bold and styled as a centered TITLE paragraph
+        cursor = 1
+        title_text = title + '\n\n'
+        requests.append({
             'insertText': {
                 'location': {
-                    'index': 1,
+                    'index': cursor,
                     'tabId': tab_id
                 },
-                'text': '\n'
+                'text': title_text
             }
-        }])
-        
-        # Add title
-        self.append_text(
-            tab_id, 
-            title + '\n\n',
-            format_bold=True
-        )
-        
-        # Apply title style
-        title_length = len(title)
-        self.batch_update([{
-            'updateParagraphStyle': {
+        })
+        requests.append({
+            'updateTextStyle': {
                 'range': {
-                    'startIndex': 1,
-                    'endIndex': 1 + title_length,
+                    'startIndex': cursor,
+                    'endIndex': cursor + len(title),
                     'tabId': tab_id
                 },
-                'paragraphStyle': {
-                    'namedStyleType': 'TITLE',
-                    'alignment': 'CENTER'
+                'textStyle': {
+                    'bold': True
                 },
-                'fields': 'namedStyleType,alignment'
+                'fields': 'bold'
             }
-        }])
-        
-        # Create formatted answer table using plain text for simplicity
-        self.append_text(tab_id, "Problem\tAnswer\n")
-        self.append_text(tab_id, "-------\t-------\n")
-        
-        # Add each problem-answer pair as a row
-        for problem, answer in zip(problems, answers):
-            row_text = f"{problem}\t{answer}\n"
-            self.append_text(tab_id, row_text)
-        
-        # Refresh document state
-        return self.fetch()
\ No newline at end of file
+        })
+        title_style = copy.deepcopy(_TITLE_STYLE_TEMPLATE)
+        title_style['updateParagraphStyle']['range'] = {
+            'startIndex': cursor,
+            'endIndex': cursor + len(title),
+            'tabId': tab_id
+        }
+        requests.append(title_style)
+        cursor += len(title_text)
+
+        # All problems as one insertText with server-side numbering, as in
+        # create_worksheet
+        if problems:
+            problems_start = cursor
+            problems_text = ''.join(f"{problem}\n" for problem in problems)
+            requests.append({
+                'insertText': {
+                    'location': {
+                        'index': cursor,
+                        'tabId': tab_id
+                    },
+                    'text': problems_text
+                }
+            })
+            cursor += len(problems_text)
+            requests.append({
+                'createParagraphBullets': {
+                    'range': {
+                        'startIndex': problems_start,
+                        'endIndex': cursor,
+                        'tabId': tab_id
+                    },
+                    'bulletPreset': number_preset
+                }
+            })
+
+        # Answer key starts on its own page; the page break is inserted
+        # followed by a newline, so it occupies two indices
+        requests.append({
+            'insertPageBreak': {
+                'location': {
+                    'index': cursor,
+                    'tabId': tab_id
+                }
+            }
+        })
+        cursor += 2
+
+        answer_header = 'Answer Key\n\n'
+        requests.append({
+            'insertText': {
+                'location': {
+                    'index': cursor,
+                    'tabId': tab_id
+                },
+                'text': answer_header
+            }
+        })
+        requests.append({
+            'updateTextStyle': {
+                'range': {
+                    'startIndex': cursor,
+                    'endIndex': cursor + len('Answer Key'),
+                    'tabId': tab_id
+                },
+                'textStyle': {
+                    'bold': True
+                },
+                'fields': 'bold'
+            }
+        })
+        cursor += len(answer_header)
+
+        # Tabular rows as plain text, matching generate_answer_sheet
+        rows = ["Problem\tAnswer\n", "-------\t-------\n"]
+        rows.extend(f"{problem}\t{answer}\n" for problem, answer in zip(problems, answers))
+        requests.append({
+            'insertText': {
+                'location': {
+                    'index': cursor,
+                    'tabId': tab_id
+                },
+                'text': ''.join(rows)
+            }
+        })
+
+        return self.batch_update(requests, refresh=refresh_after)
+
+
+async def apply_many(docs_and_requests):
+    """
+    Run batch_update concurrently across several documents.
+
+    Each (document, requests) pair runs on its own worker thread over
+    that thread's own authorized transport (see Document._execute), and
+    the calls overlap, so wall time tracks the slowest call rather than
+    the sum. Only safe across distinct document IDs — concurrent updates
+    to the same document race on its revision.
+
+    Args:
+        docs_and_requests: Iterable of (Document, requests list) pairs
+
+    Returns:
+        list: Responses from the API, in input order
+    """
+    return await asyncio.gather(*(
+        document.async_batch_update(requests)
+        for document, requests in docs_and_requests
+    ))
@@ -1,4 +1,24 @@
-def find_folder(drive_service, folder_name, parent_folder_id=None, return_all=False):
+import time
+
+from .retry import execute_with_retry
+
+# Drive's multipart batch endpoint accepts at most 100 sub-requests, and
+# the per-user write quota is roughly 10 writes per second
+BATCH_REQUEST_LIMIT = 100
+WRITES_PER_SECOND = 10
+
+# Per-process cache of lookup results so repeated generations in one run
+# don't re-pay a Drive files.list round-trip per folder/file resolution.
+# Any mutation helper clears it, since mutations can change what a
+# (name, parent) query would return.
+_lookup_cache = {}
+
+def clear_lookup_cache():
+    """Drop all cached find_folder/find_file results."""
+    _lookup_cache.clear()
+
+def find_folder(drive_service, folder_name, parent_folder_id=None, return_all=False,
+                fields='files(id, name)'):
     """
     Find a folder by name, optionally within a parent folder.
     
@@ -7,26 +27,65 @@ def find_folder(drive_service, folder_name, parent_folder_id=None, return_all=Fa
         folder_name: Name of the folder to find
         parent_folder_id: ID of the parent folder (optional)
         return_all: Whether to return all matching folders or just the first one (default: False)
+        fields: Partial-response mask limiting the attributes returned per file
         
     Returns:
         If return_all is False: Folder ID if found, None otherwise
         If return_all is True: List of folder dictionaries (id, name) if found, empty list otherwise
     """
+    cache_key = (id(drive_service), 'folder', folder_name, parent_folder_id, return_all, fields)
+    if cache_key in _lookup_cache:
+        return _lookup_cache[cache_key]
+
     query = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false"
     if parent_folder_id:
         query += f" and '{parent_folder_id}' in parents"
     
-    results = drive_service.files().list(
+    results = execute_with_retry(drive_service.files().list(
         q=query,
         spaces='drive',
-        fields='files(id, name)'
-    ).execute()
+        fields=fields
+    ))
     folders = results.get('files', [])
     
-    if return_all:
-        return folders
-    else:
-        return folders[0]['id'] if folders else None
+    result = folders if return_all else (folders[0]['id'] if folders else None)
+    # Misses aren't cached: the folder may be created moments later
+    if result:
+        _lookup_cache[cache_key] = result
+    return result
+
+def batch_lookup(drive_service, queries, fields='files(id, name)'):
+    """
+    Run several files.list queries in a single batched HTTP request.
+
+    Args:
+        drive_service: Google Drive API service instance
+        queries: Dictionary mapping a tag to a Drive query string
+        fields: Partial-response mask limiting the attributes returned per file
+
+    Returns:
+        Dictionary mapping each tag to the list of matching files (id, name)
+    """
+    results = {}
+
+    def _callback(request_id, response, exception):
+        if exception is not None:
+            raise exception
+        results[request_id] = response.get('files', [])
+
+    batch = drive_service.new_batch_http_request(callback=_callback)
+    for tag, query in queries.items():
+        batch.add(
+            drive_service.files().list(
+                q=query,
+                spaces='drive',
+                fields=fields
+            ),
+            request_id=tag
+        )
+    batch.execute()
+
+    return results
 
 def create_folder(drive_service, folder_name, parent_folder_id=None):
     """
@@ -51,7 +110,7 @@ def create_folder(drive_service, folder_name, parent_folder_id=None):
             print(f"Using the first folder found: {existing_folders[0]['id']}")
         
         # Return the first existing folder
-        return drive_service.files().get(fileId=existing_folders[0]['id'], fields='id,name').execute()
+        return execute_with_retry(drive_service.files().get(fileId=existing_folders[0]['id'], fields='id,name'))
     
     # Create new folder if none exists
     file_metadata = {
@@ -62,9 +121,10 @@ def create_folder(drive_service, folder_name, parent_folder_id=None):
     if parent_folder_id:
         file_metadata['parents'] = [parent_folder_id]
     
-    return drive_service.files().create(body=file_metadata, fields='id,name').execute()
+    clear_lookup_cache()
+    return execute_with_retry(drive_service.files().create(body=file_metadata, fields='id,name'))
 
-def find_file(drive_service, file_name, parent_folder_id=None):
+def find_file(drive_service, file_name, parent_folder_id=None, fields='files(id, name)'):
     """
     Find a file by name, optionally within a parent folder.
     
@@ -72,20 +132,29 @@ def find_file(drive_service, file_name, parent_folder_id=None):
         drive_service: Google Drive API service instance
         file_name: Name of the file to find
         parent_folder_id: ID of the parent folder (optional)
+        fields: Partial-response mask limiting the attributes returned per file
         
     Returns:
         File ID if found, None otherwise
     """
+    cache_key = (id(drive_service), 'file', file_name, parent_folder_id, fields)
+    if cache_key in _lookup_cache:
+        return _lookup_cache[cache_key]
+
     query = f"name='{file_name}' and trashed=false"
     if parent_folder_id:
         query += f" and '{parent_folder_id}' in parents"
-    results = drive_service.files().list(
+    results = execute_with_retry(drive_service.files().list(
         q=query,
         spaces='drive',
-        fields='files(id, name)'
-    ).execute()
+        fields=fields
+    ))
     files = results.get('files', [])
-    return files[0]['id'] if files else None
+    file_id = files[0]['id'] if files else None
+    # Misses aren't cached: the file may be created moments later
+    if file_id:
+        _lookup_cache[cache_key] = file_id
+    return file_id
 
 def delete_file(drive_service, file_id):
     """
@@ -98,7 +167,8 @@ def delete_file(drive_service, file_id):
     Returns:
         None
     """
-    drive_service.files().delete(fileId=file_id).execute()
+    execute_with_retry(drive_service.files().delete(fileId=file_id))
+    clear_lookup_cache()
 
 def rename_file(drive_service, file_id, new_name):
     """
@@ -112,24 +182,29 @@ def rename_file(drive_service, file_id, new_name):
     Returns:
         Updated file metadata
     """
+    clear_lookup_cache()
     file_metadata = {'name': new_name}
-    return drive_service.files().update(
+    return execute_with_retry(drive_service.files().update(
         fileId=file_id,
         body=file_metadata,
         fields='id,name'
-    ).execute()
+    ))
 
-def copy_document(drive_service, template_id, new_name, parents, overwrite=False):
+def copy_document(drive_service, template_id, new_name, parents, overwrite=False,
+                  fields='id,name'):
     """
     Create a copy of a document, optionally overwriting an existing file with the same name.
-    
+
     Args:
         drive_service: Google Drive API service instance
         template_id: ID of the template document to copy
         new_name: Name for the new document
         parents: ID or list of IDs of parent folders
         overwrite: Whether to overwrite an existing file with the same name (default: False)
-        
+        fields: Partial-response mask for the returned metadata; the
+            default keeps the response to the id and name instead of the
+            full file resource
+
     Returns:
         Dictionary containing created document metadata
     """
@@ -148,7 +223,60 @@ def copy_document(drive_service, template_id, new_name, parents, overwrite=False
         'name': new_name,
         'parents': parent_folders
     }
-    return drive_service.files().copy(fileId=template_id, body=body).execute()
+    clear_lookup_cache()
+    return execute_with_retry(drive_service.files().copy(fileId=template_id, body=body, fields=fields))
+
+def copy_documents(drive_service, template_id, names_and_parents):
+    """
+    Copy a template into many new documents using batched HTTP requests.
+
+    Copies are submitted in chunks of 100 (Drive's batch size limit) via
+    new_batch_http_request, and chunks are paced so the run stays under
+    the ~10 writes/s per-user quota.
+
+    Args:
+        drive_service: Google Drive API service instance
+        template_id: ID of the template document to copy
+        names_and_parents: List of (name, parent_folder_id) tuples
+
+    Returns:
+        List of {'name': ..., 'id': ...} dictionaries in input order
+    """
+    results = {}
+
+    def _callback(request_id, response, exception):
+        if exception is not None:
+            raise exception
+        results[int(request_id)] = response['id']
+
+    for chunk_start in range(0, len(names_and_parents), BATCH_REQUEST_LIMIT):
+        chunk = names_and_parents[chunk_start:chunk_start + BATCH_REQUEST_LIMIT]
+        batch = drive_service.new_batch_http_request(callback=_callback)
+        for offset, (name, parent_id) in enumerate(chunk):
+            batch.add(
+                drive_service.files().copy(
+                    fileId=template_id,
+                    body={'name': name, 'parents': [parent_id]},
+                    fields='id'
+                ),
+                request_id=str(chunk_start + offset)
+            )
+
+        started = time.monotonic()
+        batch.execute()
+
+        # Pace the next chunk to respect the per-user write quota
+        if chunk_start + BATCH_REQUEST_LIMIT < len(names_and_parents):
+            min_duration = len(chunk) / WRITES_PER_SECOND
+            elapsed = time.monotonic() - started
+            if elapsed < min_duration:
+                time.sleep(min_duration - elapsed)
+
+    clear_lookup_cache()
+    return [
+        {'name': name, 'id': results[i]}
+        for i, (name, _) in enumerate(names_and_parents)
+    ]
 
 def move_file(drive_service, file_id, new_parent_id, remove_parents=None):
     """
@@ -163,20 +291,21 @@ def move_file(drive_service, file_id, new_parent_id, remove_parents=None):
     Returns:
         Updated file metadata
     """
+    clear_lookup_cache()
     # Build the request
     if remove_parents:
-        return drive_service.files().update(
+        return execute_with_retry(drive_service.files().update(
             fileId=file_id,
             addParents=new_parent_id,
             removeParents=remove_parents,
             fields='id,name,parents'
-        ).execute()
+        ))
     else:
-        return drive_service.files().update(
+        return execute_with_retry(drive_service.files().update(
             fileId=file_id,
             addParents=new_parent_id,
             fields='id,name,parents'
-        ).execute()
+        ))
 
 def find_or_create_folder(drive_service, folder_name, parent_folder_id=None):
     """
@@ -204,11 +333,12 @@ def find_or_create_folder(drive_service, folder_name, parent_folder_id=None):
         if parent_folder_id:
             file_metadata['parents'] = [parent_folder_id]
         
-        return drive_service.files().create(body=file_metadata, fields='id,name').execute()
+        clear_lookup_cache()
+        return execute_with_retry(drive_service.files().create(body=file_metadata, fields='id,name'))
     
     elif len(existing_folders) == 1:
         # Only one folder exists, return it
-        return drive_service.files().get(fileId=existing_folders[0]['id'], fields='id,name').execute()
+        return execute_with_retry(drive_service.files().get(fileId=existing_folders[0]['id'], fields='id,name'))
     
     else:
         # Multiple folders exist, consolidate them
@@ -223,11 +353,11 @@ def find_or_create_folder(drive_service, folder_name, parent_folder_id=None):
             source_folder_id = folder['id']
             
             # Find all files in the source folder
-            results = drive_service.files().list(
+            results = execute_with_retry(drive_service.files().list(
                 q=f"'{source_folder_id}' in parents and trashed=false",
                 spaces='drive',
                 fields='files(id, name)'
-            ).execute()
+            ))
             
             files_to_move = results.get('files', [])
             
@@ -238,9 +368,9 @@ def find_or_create_folder(drive_service, folder_name, parent_folder_id=None):
             
             # Delete the now-empty source folder
             try:
-                drive_service.files().delete(fileId=source_folder_id).execute()
+                execute_with_retry(drive_service.files().delete(fileId=source_folder_id))
                 print(f"Deleted empty folder: {folder['name']} (ID: {source_folder_id})")
             except Exception as e:
                 print(f"Could not delete folder {folder['name']} (ID: {source_folder_id}): {str(e)}")
         
-        return drive_service.files().get(fileId=target_folder_id, fields='id,name').execute()
\ No newline at end of file
+        return execute_with_retry(drive_service.files().get(fileId=target_folder_id, fields='id,name'))
\ No newline at end of file
@@ -5,33 +5,270 @@ This module provides functionality to parse markdown text and convert it to
 the appropriate Google Docs API requests for rich text formatting.
 """
 
+import bisect
 import re
-from typing import Dict, List, Tuple, Any, Optional, Union
-import markdown  # pip install markdown
-from bs4 import BeautifulSoup  # pip install beautifulsoup4
+from typing import Callable, ClassVar, Dict, List, Tuple, Any, Optional, Union
+# markdown and bs4 (pip install markdown beautifulsoup4) are imported on
+# first block-level conversion rather than at module load: together they
+# cost tens of milliseconds of import work that callers using only the
+# inline paths never pay.
+_BeautifulSoup = None
+_HTML_PARSER = None
+
+
+def _ensure_html_deps():
+    """
+    Import bs4 lazily and resolve the HTML parser once.
+
+    lxml's C parser is preferred when installed — it parses the
+    intermediate HTML several times faster than the pure-Python backend.
+
+    Returns:
+        Tuple of (BeautifulSoup class, parser name)
+    """
+    global _BeautifulSoup, _HTML_PARSER
+    if _BeautifulSoup is None:
+        from bs4 import BeautifulSoup, FeatureNotFound
+        try:
+            BeautifulSoup('', 'lxml')
+            parser = 'lxml'
+        except FeatureNotFound:
+            parser = 'html.parser'
+        _BeautifulSoup = BeautifulSoup
+        _HTML_PARSER = parser
+    return _BeautifulSoup, _HTML_PARSER
+
+# Compiled once at import and shared by every formatter instance; these
+# run on each conversion, so per-instance compilation was pure overhead
+
+# Text formatting patterns
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.*?)\*')
+_CODE_RE = re.compile(r'`(.*?)`')
+_LINK_RE = re.compile(r'\[(.*?)\]\((.*?)\)')
+
+# List patterns
+_UNORDERED_LIST_RE = re.compile(r'^\s*[\*\-\+]\s+(.*?)$', re.MULTILINE)
+_ORDERED_LIST_RE = re.compile(r'^\s*(\d+)\.?\s+(.*?)$', re.MULTILINE)
+
+# Table patterns
+_TABLE_RE = re.compile(r'^\|(.+)\|$', re.MULTILINE)
+_TABLE_SEPARATOR_RE = re.compile(r'^\|(\s*[-:]+[-|\s:]*)\|$', re.MULTILINE)
+
+# Header pattern
+_HEADER_RE = re.compile(r'^(#{1,6})\s+(.*?)$', re.MULTILINE)
+
+# Block-level markdown detector: headers, blockquotes, list markers,
+# fenced code, or tables at line start. Inputs without any of these only
+# carry inline formatting, which the fused scanner handles without the
+# markdown -> HTML -> BeautifulSoup pipeline.
+_COMPLEX_RE = re.compile(r'^\s{0,3}(?:[#>*\-+]|\d+\.|```|\|)', re.MULTILINE)
+
+# Native block tokenizer: per-line classifiers for the middle path that
+# handles headings, flat lists, and plain paragraphs without the HTML
+# pipeline. Anything matching the unsupported pattern — blockquotes,
+# tables, fenced/indented code, raw HTML, nested lists, rules — falls
+# back to the full markdown -> soup conversion.
+_NATIVE_HEADER_RE = re.compile(r'(#{1,6})\s+(.*)')
+_NATIVE_UL_RE = re.compile(r'[*\-+]\s+(.*)')
+_NATIVE_OL_RE = re.compile(r'\d+\.\s+(.*)')
+_NATIVE_UNSUPPORTED_RE = re.compile(
+    r'^(?:[ \t]{4,}\S'
+    r'|[ \t]*(?:>|\||```|<)'
+    r'|[ \t]+(?:[*\-+]|\d+\.)[ \t]'
+    r'|[ \t]*(?:-{3,}|={3,}|_{3,}|\*{3,})[ \t]*$)',
+    re.MULTILINE
+)
+
+# Single alternation covering everything _remove_markdown_syntax strips;
+# one scan replaces the seven sequential re.sub passes (and seven full
+# string copies) the old implementation made. Line-anchored markers come
+# first so "**bold**" at line start still parses as bold, not a bullet.
+_STRIP_RE = re.compile(
+    r'(?P<hdr>^#{1,6}\s+)'
+    r'|(?P<ol>^\s*\d+\.\s+)'
+    r'|(?P<ul>^\s*[\*\-\+]\s+)'
+    r'|\*\*(?P<bold>.*?)\*\*'
+    r'|\*(?P<it>.*?)\*'
+    r'|`(?P<code>.*?)`'
+    r'|\[(?P<lnk>.*?)\]\((?P<url>.*?)\)',
+    re.MULTILINE
+)
+
+
+# Each markdown construct maps to a fixed (textStyle, fields) pair, so
+# both halves are built once here instead of re-deriving the fields mask
+# from the style dict's keys per span. The dicts are shared — consumers
+# must treat them as read-only. Links are the exception: their style
+# embeds the URL, so only the fields mask is constant.
+_CODE_FONT = {'fontFamily': 'Courier New'}
+_CODE_BG = {'color': {'rgbColor': {'red': 0.95, 'green': 0.95, 'blue': 0.95}}}
+
+_STYLE_BOLD = ({'bold': True}, 'bold')
+_STYLE_ITALIC = ({'italic': True}, 'italic')
+_STYLE_CODE = (
+    {'weightedFontFamily': _CODE_FONT, 'backgroundColor': _CODE_BG},
+    'weightedFontFamily,backgroundColor'
+)
+_LINK_FIELDS = 'link'
+
+# Inline HTML tags mapped to their (textStyle, fields) pairs; O(1)
+# lookup for the inline-format walker. <a> is handled separately since
+# its style depends on the href.
+_INLINE_TAG_STYLES = {
+    'strong': _STYLE_BOLD,
+    'b': _STYLE_BOLD,
+    'em': _STYLE_ITALIC,
+    'i': _STYLE_ITALIC,
+    'code': _STYLE_CODE,
+}
+
+
+# Quick membership guards: a text containing none of these characters
+# cannot match the corresponding patterns, so scans can bail after a few
+# C-level `in` probes instead of running the full regex machinery.
+# Inline spans need one of * ` [ ; stripping additionally removes
+# headers (#), unordered markers (- +), and ordered markers (digit.).
+_INLINE_SYNTAX_CHARS = '*`['
+_SYNTAX_CHARS = '*`[#-+.'
+
+
+def _style_request(start: int, end: int, style: Dict[str, Any], fields: str) -> Dict[str, Any]:
+    """Build an updateTextStyle request for [start, end) with the given style."""
+    return {
+        'updateTextStyle': {
+            'range': {
+                'startIndex': start,
+                'endIndex': end
+            },
+            'textStyle': style,
+            'fields': fields
+        }
+    }
+
+
+def _strip_repl(match: re.Match) -> str:
+    """Replacement for _STRIP_RE: markers vanish, wrapped content stays."""
+    for name in ('bold', 'it', 'code', 'lnk'):
+        content = match.group(name)
+        if content is not None:
+            # Emphasis nests (**a *b* c**): the outer match consumes the
+            # whole run, so markers inside the captured content must be
+            # stripped with another pass
+            if any(c in content for c in _INLINE_SYNTAX_CHARS):
+                return _STRIP_RE.sub(_strip_repl, content)
+            return content
+    return ''
+
+
+def _clean_and_spans(text: str) -> Tuple[str, List[Tuple[int, int, Dict[str, Any], str]]]:
+    """
+    Produce the cleaned text and its formatting spans in one scan.
+
+    Fuses what used to be separate passes — syntax stripping, span
+    identification, and raw-to-cleaned position translation — into a
+    single walk over _STRIP_RE matches. Span positions are emitted
+    directly in cleaned-text coordinates, so no offset translation is
+    needed afterwards.
+
+    Args:
+        text: Markdown text to process
+
+    Returns:
+        Tuple of (cleaned text, list of (start, end, style, fields) spans
+        with positions relative to the cleaned text)
+    """
+    if not any(c in text for c in _SYNTAX_CHARS):
+        return text, []
+
+    parts = []
+    spans = []
+    clean_len = 0
+    last = 0
+
+    for match in _STRIP_RE.finditer(text):
+        parts.append(text[last:match.start()])
+        clean_len += match.start() - last
+        last = match.end()
+
+        if match.group('bold') is not None:
+            content, (style, fields) = match.group('bold'), _STYLE_BOLD
+        elif match.group('it') is not None:
+            content, (style, fields) = match.group('it'), _STYLE_ITALIC
+        elif match.group('code') is not None:
+            content, (style, fields) = match.group('code'), _STYLE_CODE
+        elif match.group('lnk') is not None:
+            content = match.group('lnk')
+            style, fields = {'link': {'url': match.group('url')}}, _LINK_FIELDS
+        else:
+            # Header or list marker: stripped with nothing to style
+            continue
+
+        # Emphasis nests (**a *b* c**): the outer match consumes the whole
+        # run, so clean the captured content too and lift its spans into
+        # cleaned-text coordinates
+        if any(c in content for c in _INLINE_SYNTAX_CHARS):
+            content, nested = _clean_and_spans(content)
+            spans.extend(
+                (clean_len + nested_start, clean_len + nested_end,
+                 nested_style, nested_fields)
+                for nested_start, nested_end, nested_style, nested_fields in nested
+            )
+
+        parts.append(content)
+        spans.append((clean_len, clean_len + len(content), style, fields))
+        clean_len += len(content)
+
+    parts.append(text[last:])
+    return ''.join(parts), spans
+
+
+def _bold_containment(text: str) -> Callable[[int, int], bool]:
+    """
+    Build an O(log B) containment test over the text's bold spans.
+
+    The bold intervals are collected once and binary-searched per query,
+    replacing the re-scan of every bold match for every italic candidate.
+
+    Args:
+        text: Markdown text to index
+
+    Returns:
+        Callable taking (start, end) and returning True when that span lies
+        inside a bold match
+    """
+    ranges = [(m.start(), m.end()) for m in _BOLD_RE.finditer(text)]
+    starts = [start for start, _ in ranges]
+
+    def contains(start: int, end: int) -> bool:
+        idx = bisect.bisect_right(starts, start) - 1
+        return idx >= 0 and ranges[idx][1] >= end
+
+    return contains
 
 
 class MarkdownFormatter:
     """Converts markdown text to Google Docs API formatting requests."""
     
+    # Shared compiled patterns, kept as class attributes for callers that
+    # accessed them through the instance. Annotated explicitly so typed
+    # tooling (and an eventual AOT compiler) sees fixed attribute types.
+    bold_pattern: ClassVar[re.Pattern] = _BOLD_RE
+    italic_pattern: ClassVar[re.Pattern] = _ITALIC_RE
+    code_pattern: ClassVar[re.Pattern] = _CODE_RE
+    link_pattern: ClassVar[re.Pattern] = _LINK_RE
+    unordered_list_pattern: ClassVar[re.Pattern] = _UNORDERED_LIST_RE
+    ordered_list_pattern: ClassVar[re.Pattern] = _ORDERED_LIST_RE
+    table_pattern: ClassVar[re.Pattern] = _TABLE_RE
+    table_separator_pattern: ClassVar[re.Pattern] = _TABLE_SEPARATOR_RE
+    header_pattern: ClassVar[re.Pattern] = _HEADER_RE
+
     def __init__(self):
-        """Initialize the markdown formatter with regex patterns for markdown elements."""
-        # Text formatting patterns
-        self.bold_pattern = re.compile(r'\*\*(.*?)\*\*')
-        self.italic_pattern = re.compile(r'\*(.*?)\*')
-        self.code_pattern = re.compile(r'`(.*?)`')
-        self.link_pattern = re.compile(r'\[(.*?)\]\((.*?)\)')
-        
-        # List patterns
-        self.unordered_list_pattern = re.compile(r'^\s*[\*\-\+]\s+(.*?)$', re.MULTILINE)
-        self.ordered_list_pattern = re.compile(r'^\s*(\d+)\.?\s+(.*?)$', re.MULTILINE)
-        
-        # Table pattern
-        self.table_pattern = re.compile(r'^\|(.+)\|$', re.MULTILINE)
-        self.table_separator_pattern = re.compile(r'^\|(\s*[-:]+[-|\s:]*)\|$', re.MULTILINE)
-        
-        # Header patterns
-        self.header_pattern = re.compile(r'^(#{1,6})\s+(.*?)$', re.MULTILINE)
+        # One converter per formatter, created on first block-level
+        # conversion (the markdown import itself is deferred): building a
+        # fresh Markdown instance per call is pure setup cost in bulk
+        # runs, and reset() clears per-document state between uses.
+        self._md = None
 
     def parse(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -56,59 +293,43 @@ class MarkdownFormatter:
     def _identify_all_spans(self, text: str) -> List[Tuple[int, int, Dict[str, Any]]]:
         """
         Identify all spans of text that need formatting.
-        
+
+        A single scan of the combined alternation replaces the former four
+        separate finditer passes (bold, italic, code, link) over the same
+        text. Because the bold branch precedes the italic one, a '**…**'
+        run is consumed as bold and can never re-match as italic, so no
+        containment check is needed.
+
         Args:
             text: Text to analyze
-            
+
         Returns:
-            List of (start, end, style_dict) tuples
+            List of (start, end, style_dict) tuples, ordered by start
+            position; positions cover the content between the markers
         """
+        if not any(c in text for c in _INLINE_SYNTAX_CHARS):
+            return []
+
         spans = []
-        
-        # Find all bold spans
-        for match in self.bold_pattern.finditer(text):
-            # The span is from the start to end, but we don't include the ** markers
-            start = match.start() + 2
-            end = match.end() - 2
-            spans.append((start, end, {'bold': True}))
-        
-        # Find all italic spans
-        for match in self.italic_pattern.finditer(text):
-            # Skip if this is inside a bold pattern (which uses ** which would match *)
-            # This is a simplified approach and might need refinement
-            is_inside_bold = False
-            for bold_match in self.bold_pattern.finditer(text):
-                if bold_match.start() <= match.start() and bold_match.end() >= match.end():
-                    is_inside_bold = True
-                    break
-            
-            if not is_inside_bold:
-                start = match.start() + 1
-                end = match.end() - 1
-                spans.append((start, end, {'italic': True}))
-        
-        # Find all code spans
-        for match in self.code_pattern.finditer(text):
-            start = match.start() + 1
-            end = match.end() - 1
-            # For code blocks, we might want to use monospace font and potentially a background color
-            spans.append((start, end, {
-                'weightedFontFamily': {'fontFamily': 'Courier New'},
-                'backgroundColor': {'color': {'rgbColor': {'red': 0.95, 'green': 0.95, 'blue': 0.95}}}
-            }))
-        
-        # Find all links
-        for match in self.link_pattern.finditer(text):
-            start = match.start()
-            end = match.end()
-            text_part = match.group(1)
-            url_part = match.group(2)
-            # For links, we'll need to handle this specially since it requires link object creation
-            spans.append((start, end, {'link': {'url': url_part}}))
-        
-        # Sort by start position for processing
-        spans.sort(key=lambda x: x[0])
-        
+
+        for match in _STRIP_RE.finditer(text):
+            if match.group('bold') is not None:
+                group, style = 'bold', _STYLE_BOLD[0]
+            elif match.group('it') is not None:
+                group, style = 'it', _STYLE_ITALIC[0]
+            elif match.group('code') is not None:
+                group, style = 'code', _STYLE_CODE[0]
+            elif match.group('lnk') is not None:
+                group = 'lnk'
+                style = {'link': {'url': match.group('url')}}
+            else:
+                # Header or list marker: nothing to style
+                continue
+
+            spans.append((match.start(group), match.end(group), style))
+
+        # finditer yields matches left to right, so spans are already
+        # sorted by start position
         return spans
 
     def create_text_insertion_requests(self, text: str, index: int) -> Tuple[List[Dict[str, Any]], int]:
@@ -122,8 +343,9 @@ class MarkdownFormatter:
         Returns:
             Tuple of (requests list, new index after insertion)
         """
-        # Get the cleaned text without markdown syntax
-        cleaned_text = self._remove_markdown_syntax(text)
+        # One fused scan yields the cleaned text and every formatting span
+        # already in cleaned-text coordinates
+        cleaned_text, spans = _clean_and_spans(text)
         if not cleaned_text.strip():
             cleaned_text = " "  # Avoid empty text
         
@@ -137,67 +359,13 @@ class MarkdownFormatter:
             }
         ]
         
-        # Process links separately for better link handling
-        link_matches = list(self.link_pattern.finditer(text))
-        for match in link_matches:
-            text_part = match.group(1)
-            url_part = match.group(2)
-            
-            # Find where this text appears in the cleaned text
-            text_in_cleaned = cleaned_text.find(text_part)
-            
-            if text_in_cleaned >= 0:
-                # Add link formatting
-                requests.append({
-                    'updateTextStyle': {
-                        'range': {
-                            'startIndex': index + text_in_cleaned,
-                            'endIndex': index + text_in_cleaned + len(text_part)
-                        },
-                        'textStyle': {
-                            'link': {'url': url_part}
-                        },
-                        'fields': 'link'
-                    }
-                })
-        
-        # Now add regular formatting requests (bold, italic, code)
-        spans = self._identify_all_spans(text)
-        
-        for start, end, style in spans:
-            # Skip link spans as we've already handled them
-            if 'link' in style:
-                continue
-                
-            # Convert the span positions from the markdown text to the cleaned text
-            clean_start = start - self._count_preceding_syntax_chars(text, start)
-            clean_end = end - self._count_preceding_syntax_chars(text, end)
-            
+        for clean_start, clean_end, style, fields in spans:
             # Ensure ranges aren't empty and are valid
-            if clean_start >= clean_end or clean_start < 0 or clean_end > len(cleaned_text):
+            if clean_start >= clean_end or clean_end > len(cleaned_text):
                 continue  # Skip invalid ranges
-            
-            # Prepare the fields list - only include valid and present fields
-            style_fields = []
-            for key in style:
-                style_fields.append(key)
-            
-            # Skip if no valid fields
-            if not style_fields:
-                continue
-                
-            # Add a text style update request
-            requests.append({
-                'updateTextStyle': {
-                    'range': {
-                        'startIndex': index + clean_start,
-                        'endIndex': index + clean_end
-                    },
-                    'textStyle': style,
-                    'fields': ','.join(style_fields)
-                }
-            })
-        
+
+            requests.append(_style_request(index + clean_start, index + clean_end, style, fields))
+
         return requests, index + len(cleaned_text)
     
     def _remove_markdown_syntax(self, text: str) -> str:
@@ -211,106 +379,9 @@ class MarkdownFormatter:
             Text with markdown syntax removed, including headers, bold, italic,
             code markers, and list markers.
         """
-        # Remove header markers (e.g., "# ")
-        text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-        # Remove bold markers
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-        # Remove italic markers
-        text = re.sub(r'\*(.*?)\*', r'\1', text)
-        # Remove inline code markers
-        text = re.sub(r'`(.*?)`', r'\1', text)
-        # Convert links to just the text part
-        text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-        # Remove ordered list markers (e.g., "1. ", "2. ", etc.)
-        text = re.sub(r'^\s*\d+\.\s+', '', text, flags=re.MULTILINE)
-        # Remove unordered list markers (e.g., "* ", "- ", "+ ")
-        text = re.sub(r'^\s*[\*\-\+]\s+', '', text, flags=re.MULTILINE)
-        # (Add any other syntax removals as needed)
-        return text
-    
-    def _count_preceding_syntax_chars(self, text: str, position: int) -> int:
-        """
-        Count syntax characters preceding the given position.
-        
-        Args:
-            text: The text to analyze
-            position: The position to check before
-            
-        Returns:
-            Count of syntax characters
-        """
-        # Count markdown syntax characters that would be removed
-        # This is an improved implementation to track position shifts
-        
-        # Characters to consider as syntax
-        syntax_counts = 0
-        
-        # Count bold markers (**) before this position
-        for match in self.bold_pattern.finditer(text):
-            if match.start() < position:
-                # If we're inside the bold section, only count the chars before our position
-                if match.end() > position:
-                    # Count the opening ** only
-                    syntax_counts += 2
-                else:
-                    # Count both opening and closing ** (total 4 chars)
-                    syntax_counts += 4
-        
-        # Count italic markers (*) before this position
-        for match in self.italic_pattern.finditer(text):
-            # Skip if this is inside a bold pattern which we've already counted
-            is_inside_bold = False
-            for bold_match in self.bold_pattern.finditer(text):
-                if bold_match.start() <= match.start() and bold_match.end() >= match.end():
-                    is_inside_bold = True
-                    break
-            
-            if not is_inside_bold:
-                if match.start() < position:
-                    # If we're inside the italic section, only count the chars before our position
-                    if match.end() > position:
-                        # Count the opening * only
-                        syntax_counts += 1
-                    else:
-                        # Count both opening and closing * (total 2 chars)
-                        syntax_counts += 2
-        
-        # Count code markers (`) before this position
-        for match in self.code_pattern.finditer(text):
-            if match.start() < position:
-                # If we're inside the code section, only count the chars before our position
-                if match.end() > position:
-                    # Count the opening ` only
-                    syntax_counts += 1
-                else:
-                    # Count both opening and closing ` (total 2 chars)
-                    syntax_counts += 2
-        
-        # Count link markers before this position
-        for match in self.link_pattern.finditer(text):
-            if match.start() < position:
-                # Links have format [text](url)
-                # We need to count [, ], (, and ) plus the URL that's not in the cleaned text
-                text_part = match.group(1)
-                url_part = match.group(2)
-                
-                if match.end() > position:
-                    # We're inside the link, compute exact position
-                    if match.start() + 1 + len(text_part) + 1 < position:
-                        # We're after the text part, include the brackets and opening parens
-                        syntax_counts += 3  # [, ], and (
-                        # Count how much of the URL we've passed
-                        url_chars_passed = position - (match.start() + 1 + len(text_part) + 2)
-                        if url_chars_passed > 0:
-                            syntax_counts += min(url_chars_passed, len(url_part))
-                    else:
-                        # We're in the text part, just count the opening bracket
-                        syntax_counts += 1
-                else:
-                    # Count the entire syntax: [, ], (, ), and the URL
-                    syntax_counts += 4 + len(url_part)
-        
-        return syntax_counts
+        if not any(c in text for c in _SYNTAX_CHARS):
+            return text
+        return _STRIP_RE.sub(_strip_repl, text)
     
     def convert_to_doc_requests(self, text: str, start_index: int) -> List[Dict[str, Any]]:
         """
@@ -322,92 +393,238 @@ class MarkdownFormatter:
         :param start_index: The position in the document where we should begin inserting
         :return: A list of Google Docs API requests
         """
-        # STEP 1: Convert Markdown to HTML via python-markdown
-        html_string = markdown.markdown(text)  # e.g. <p>Some text</p>, <ul><li>...</li></ul>, etc.
+        # Fast path: no block-level syntax means no need for the three-
+        # parser pipeline — the inline scanner produces the same requests
+        if not _COMPLEX_RE.search(text):
+            return self.create_text_insertion_requests(text, start_index)[0]
+
+        # Middle path: headings, flat lists, and paragraphs are tokenized
+        # line by line without building HTML and soup trees
+        native_requests = self._native_block_requests(text, start_index)
+        if native_requests is not None:
+            return native_requests
+
+        # STEP 1: Convert Markdown to HTML via the cached converter
+        soup_class, html_parser = _ensure_html_deps()
+        if self._md is None:
+            import markdown  # deferred with bs4; see _ensure_html_deps
+            self._md = markdown.Markdown(output_format='html5')
+        html_string = self._md.reset().convert(text)  # e.g. <p>Some text</p>, <ul><li>...</li></ul>, etc.
 
         # STEP 2: Parse the HTML string into a BeautifulSoup DOM
-        soup = BeautifulSoup(html_string, "html.parser")
-
-        requests: List[Dict[str, Any]] = []
+        soup = soup_class(html_string, html_parser)
+
+        # Block processors append their text to buf and emit only style
+        # and bullet requests; one insertText at start_index carries the
+        # whole document body. Fewer batchUpdate entries means smaller
+        # request JSON and less per-request processing server-side.
+        buf: List[str] = []
+        style_requests: List[Dict[str, Any]] = []
         insertion_index = start_index
 
+        # lxml wraps fragments in <html><body>; unwrap so both backends
+        # expose the block elements at the top level
+        root = soup.body if soup.body is not None else soup
+
         # We'll process block-level elements in order, so that the text is inserted into the doc in sequence.
-        for block in soup.contents:
+        for block in root.contents:
             # If it's just whitespace or a newline, ignore
             if not block.name and not block.strip():
                 continue
 
             if block.name == 'p':
                 # Basic paragraph
-                block_requests, insertion_index = self._process_paragraph(block, insertion_index)
-                requests.extend(block_requests)
+                block_requests, insertion_index = self._process_paragraph(block, insertion_index, buf)
 
             elif block.name and block.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
                 # Headings
-                block_requests, insertion_index = self._process_heading(block, insertion_index)
-                requests.extend(block_requests)
+                block_requests, insertion_index = self._process_heading(block, insertion_index, buf)
 
             elif block.name == 'ul':
                 # Unordered list
-                block_requests, insertion_index = self._process_list(block, insertion_index, ordered=False)
-                requests.extend(block_requests)
+                block_requests, insertion_index = self._process_list(block, insertion_index, buf, ordered=False)
 
             elif block.name == 'ol':
                 # Ordered list
-                block_requests, insertion_index = self._process_list(block, insertion_index, ordered=True)
-                requests.extend(block_requests)
-            
+                block_requests, insertion_index = self._process_list(block, insertion_index, buf, ordered=True)
+
             else:
                 # Fallback: treat as paragraph
-                block_requests, insertion_index = self._process_paragraph(block, insertion_index)
-                requests.extend(block_requests)
+                block_requests, insertion_index = self._process_paragraph(block, insertion_index, buf)
 
+            style_requests.extend(block_requests)
+
+        if not buf:
+            return []
+
+        requests: List[Dict[str, Any]] = [{
+            'insertText': {
+                'location': {'index': start_index},
+                'text': ''.join(buf)
+            }
+        }]
+        requests.extend(style_requests)
         return requests
 
-    def _process_paragraph(self, block, insertion_index: int) -> Tuple[List[Dict[str, Any]], int]:
+    def to_batch_requests(self, tab_id: Optional[str], start_index: int, markdown_text: str) -> List[Dict[str, Any]]:
         """
-        Insert a paragraph node's text, then apply any inline formatting such as <strong>, <em>, <code>, <a>.
+        Convert markdown straight into a batchUpdate-ready request list.
+
+        Thin wrapper over convert_to_doc_requests that stamps an optional
+        tab ID onto every location and range, so a whole markdown document
+        ships as one Document.batch_update call regardless of length.
+
+        Args:
+            tab_id: Tab to target, or None to let the API resolve the
+                document's only tab
+            start_index: Position in the document to insert at
+            markdown_text: Markdown text to convert
+
+        Returns:
+            List of Google Docs API requests
+        """
+        requests = self.convert_to_doc_requests(markdown_text, start_index)
+        if tab_id is not None:
+            for request in requests:
+                for body in request.values():
+                    location = body.get('location')
+                    if location is not None:
+                        location['tabId'] = tab_id
+                    range_ = body.get('range')
+                    if range_ is not None:
+                        range_['tabId'] = tab_id
+        return requests
+
+    def _native_block_requests(self, text: str, start_index: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Tokenize simple block markdown in one pass over the lines and build
+        requests directly, bypassing the markdown -> HTML -> soup pipeline.
+
+        Returns:
+            The request list, or None when the text uses a construct the
+            tokenizer does not cover so the caller falls back to the full
+            pipeline.
+        """
+        if _NATIVE_UNSUPPORTED_RE.search(text):
+            return None
+
+        buf: List[str] = []
+        style_requests: List[Dict[str, Any]] = []
+        index = start_index
+        list_start: Optional[int] = None
+        list_preset: Optional[str] = None
+
+        def _append_segment(content: str) -> Tuple[int, int]:
+            nonlocal index
+            cleaned, spans = _clean_and_spans(content)
+            cleaned += '\n'
+            buf.append(cleaned)
+            for clean_start, clean_end, style, fields in spans:
+                style_requests.append(_style_request(index + clean_start, index + clean_end, style, fields))
+            segment_start = index
+            index += len(cleaned)
+            return segment_start, index
+
+        def _flush_list() -> None:
+            nonlocal list_start, list_preset
+            if list_start is not None:
+                style_requests.append({
+                    'createParagraphBullets': {
+                        'range': {
+                            'startIndex': list_start,
+                            'endIndex': index
+                        },
+                        'bulletPreset': list_preset
+                    }
+                })
+                list_start = None
+                list_preset = None
+
+        for line in text.splitlines():
+            if not line.strip():
+                _flush_list()
+                continue
+
+            header = _NATIVE_HEADER_RE.fullmatch(line)
+            if header is not None:
+                _flush_list()
+                segment_start, segment_end = _append_segment(header.group(2))
+                style_requests.append({
+                    'updateParagraphStyle': {
+                        'range': {
+                            'startIndex': segment_start,
+                            'endIndex': segment_end
+                        },
+                        'paragraphStyle': {
+                            'namedStyleType': f'HEADING_{len(header.group(1))}'
+                        },
+                        'fields': 'namedStyleType'
+                    }
+                })
+                continue
+
+            item = _NATIVE_UL_RE.fullmatch(line)
+            preset = 'BULLET_DISC_CIRCLE_SQUARE'
+            if item is None:
+                item = _NATIVE_OL_RE.fullmatch(line)
+                preset = 'NUMBERED_DECIMAL_ALPHA_ROMAN'
+            if item is not None:
+                # Switching between bullet and numbered starts a new run
+                if list_preset != preset:
+                    _flush_list()
+                segment_start, _ = _append_segment(item.group(1))
+                if list_start is None:
+                    list_start = segment_start
+                    list_preset = preset
+                continue
+
+            _flush_list()
+            _append_segment(line)
+
+        _flush_list()
+
+        if not buf:
+            return []
+
+        requests: List[Dict[str, Any]] = [{
+            'insertText': {
+                'location': {'index': start_index},
+                'text': ''.join(buf)
+            }
+        }]
+        requests.extend(style_requests)
+        return requests
+
+    def _process_paragraph(self, block, insertion_index: int, buf: List[str]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Append a paragraph node's text to the buffer and return any inline
+        formatting requests such as <strong>, <em>, <code>, <a>.
         """
-        requests: List[Dict[str, Any]] = []
         paragraph_text = block.get_text()
         if not paragraph_text.strip():
             paragraph_text = "\n"  # Insert a blank line for empty paragraphs
         else:
             paragraph_text += "\n"  # Ensure newline at paragraph end
 
-        # Insert the paragraph text
-        requests.append({
-            'insertText': {
-                'location': {'index': insertion_index},
-                'text': paragraph_text
-            }
-        })
-
+        buf.append(paragraph_text)
         start_offset = insertion_index
-        end_offset = insertion_index + len(paragraph_text)
-        new_insertion_index = end_offset
+        new_insertion_index = insertion_index + len(paragraph_text)
 
-        # Now apply inline formatting by iterating over the block's children
+        # Inline formatting requests for the block's children
         # (e.g. <strong>, <em>, <code>, <a>)
-        inline_requests = self._generate_inline_format_requests(block, start_offset)
-        requests.extend(inline_requests)
+        requests = self._generate_inline_format_requests(block, start_offset)
 
         # If we want to maintain normal paragraph styling, we can do so here:
         # e.g., no bullet, no heading style, just normal text
         return requests, new_insertion_index
 
-    def _process_heading(self, block, insertion_index: int) -> Tuple[List[Dict[str, Any]], int]:
+    def _process_heading(self, block, insertion_index: int, buf: List[str]) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Insert the heading text, then apply the relevant heading style (HEADING_1 through HEADING_6).
+        Append the heading text to the buffer and return the relevant heading
+        style request (HEADING_1 through HEADING_6) plus inline formatting.
         """
-        requests: List[Dict[str, Any]] = []
         heading_text = block.get_text() + "\n"  # ensure newline after heading
-        requests.append({
-            'insertText': {
-                'location': {'index': insertion_index},
-                'text': heading_text
-            }
-        })
+        buf.append(heading_text)
 
         start_offset = insertion_index
         end_offset = insertion_index + len(heading_text)
@@ -419,7 +636,7 @@ class MarkdownFormatter:
             level = 1
 
         # Apply the heading style
-        requests.append({
+        requests: List[Dict[str, Any]] = [{
             'updateParagraphStyle': {
                 'range': {
                     'startIndex': start_offset,
@@ -430,18 +647,17 @@ class MarkdownFormatter:
                 },
                 'fields': 'namedStyleType'
             }
-        })
+        }]
 
         # Also apply inline formatting within the heading (e.g., <strong> inside an <h2>)
-        inline_requests = self._generate_inline_format_requests(block, start_offset)
-        requests.extend(inline_requests)
+        requests.extend(self._generate_inline_format_requests(block, start_offset))
 
         return requests, new_insertion_index
 
-    def _process_list(self, block, insertion_index: int, ordered: bool) -> Tuple[List[Dict[str, Any]], int]:
+    def _process_list(self, block, insertion_index: int, buf: List[str], ordered: bool) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Insert a list (either <ul> or <ol>). Each <li> becomes a bullet or a numbered list item.
-        We gather all paragraphs within each <li> and insert them at once, preserving inter-paragraph blank lines
+        Append a list (either <ul> or <ol>) to the buffer. Each <li> becomes a bullet or a numbered list item.
+        We gather all paragraphs within each <li> and buffer them at once, preserving inter-paragraph blank lines
         but not creating extra bullets.
         """
         requests: List[Dict[str, Any]] = []
@@ -455,7 +671,7 @@ class MarkdownFormatter:
         for li_idx, list_item in enumerate(list_items):
             # Gather all <p> (and possibly <br>) inside this <li>
             paragraphs = list_item.find_all('p', recursive=False)
-            
+
             if paragraphs:
                 # If there are multiple <p> tags, join them with blank lines or single newlines
                 # so they remain in the same bullet. Here we use double newlines for spacing:
@@ -474,27 +690,22 @@ class MarkdownFormatter:
                 # If no <p> tags, just use the text from the <li> itself
                 li_text = list_item.get_text().rstrip() + "\n"
 
-            # Insert text (all paragraphs as one chunk)
-            requests.append({
-                'insertText': {
-                    'location': {'index': insertion_index},
-                    'text': li_text
-                }
-            })
+            # Buffer the item text (all paragraphs as one chunk)
+            buf.append(li_text)
 
+            item_start_index = insertion_index
             if list_item_start_index is None:
                 list_item_start_index = insertion_index
-            
+
             insertion_index += len(li_text)
             list_item_end_index = insertion_index
 
-            # Now apply inline formatting inside this <li> 
-            # (bold, italic, links, etc.). Because we merged paragraphs, we call
-            # _generate_inline_format_requests() on each paragraph or on list_item:
-            inline_requests = self._generate_inline_format_requests(list_item, list_item_start_index)
+            # Now apply inline formatting inside this <li>
+            # (bold, italic, links, etc.), anchored at this item's own start
+            inline_requests = self._generate_inline_format_requests(list_item, item_start_index)
             requests.extend(inline_requests)
 
-        # Once we've inserted all items, apply bullet or numbered style
+        # Once we've buffered all items, apply bullet or numbered style
         if list_item_start_index is not None and list_item_end_index is not None:
             bullet_preset = 'BULLET_DISC_CIRCLE_SQUARE' if not ordered else 'NUMBERED_DECIMAL_ALPHA_ROMAN'
             requests.append({
@@ -511,63 +722,44 @@ class MarkdownFormatter:
 
     def _generate_inline_format_requests(self, parent_tag, insertion_offset: int) -> List[Dict[str, Any]]:
         """
-        Recursively walk an element's children to find <strong>, <em>, <a>, <code>, etc.
-        Returns a list of 'updateTextStyle' requests (and possibly 'insertText' if needed).
-        Each text snippet is found by its position in the parent's get_text().
+        Walk an element's children to find <strong>, <em>, <a>, <code>, etc.
+        Returns a list of 'updateTextStyle' requests. A running offset is
+        carried through the traversal, so each snippet's position is known
+        exactly — including repeated identical substrings, which a find()
+        against the parent text would mis-place.
         """
         requests: List[Dict[str, Any]] = []
-        parent_text = parent_tag.get_text()
-
-        # We'll keep track of the absolute offset of each snippet. We can use a running index or a method like find().
-        # For robust handling of repeated substrings, you'd do a deeper approach, but here's a simple example:
-        child_strings = []
-        for elem in parent_tag.descendants:
-            if elem.name in ['strong', 'b', 'em', 'i', 'code', 'a']:
-                # Retrieve the text for this inline node
-                snippet = elem.get_text()
-                if not snippet:
-                    continue
-                # Find snippet occurrence in the parent text
-                snippet_start = parent_text.find(snippet)
-                if snippet_start == -1:
-                    continue
-                snippet_end = snippet_start + len(snippet)
-
-                # Build style dict
-                style = {}
-                fields = []
-                if elem.name in ['strong', 'b']:
-                    style['bold'] = True
-                    fields.append('bold')
-                if elem.name in ['em', 'i']:
-                    style['italic'] = True
-                    fields.append('italic')
-                if elem.name == 'code':
-                    style['weightedFontFamily'] = {'fontFamily': 'Courier New'}
-                    style['backgroundColor'] = {
-                        'color': {
-                            'rgbColor': {'red': 0.95, 'green': 0.95, 'blue': 0.95}
-                        }
-                    }
-                    fields.extend(['weightedFontFamily', 'backgroundColor'])
-                if elem.name == 'a':
-                    # Get link from <a> tag
-                    href = elem.get('href')
+
+        def _walk(node, offset: int) -> int:
+            name = getattr(node, 'name', None)
+            if name is None:
+                # NavigableString: advance past its characters
+                return offset + len(str(node))
+
+            snippet_length = len(node.get_text())
+            if snippet_length:
+                if name == 'a':
+                    href = node.get('href')
                     if href:
-                        style['link'] = {'url': href}
-                        fields.append('link')
+                        requests.append(_style_request(
+                            offset, offset + snippet_length,
+                            {'link': {'url': href}}, _LINK_FIELDS
+                        ))
+                else:
+                    tag_style = _INLINE_TAG_STYLES.get(name)
+                    if tag_style is not None:
+                        style, fields = tag_style
+                        requests.append(_style_request(
+                            offset, offset + snippet_length, style, fields
+                        ))
 
-                # Generate request
-                requests.append({
-                    'updateTextStyle': {
-                        'range': {
-                            'startIndex': insertion_offset + snippet_start,
-                            'endIndex': insertion_offset + snippet_end
-                        },
-                        'textStyle': style,
-                        'fields': ','.join(fields)
-                    }
-                })
+            for child in node.children:
+                offset = _walk(child, offset)
+            return offset
+
+        offset = insertion_offset
+        for child in parent_tag.children:
+            offset = _walk(child, offset)
 
         return requests
 
@@ -596,23 +788,11 @@ class MarkdownFormatter:
 
             # If found in the cleaned text, apply "monospace" style
             if text_pos >= 0:
-                requests.append({
-                    'updateTextStyle': {
-                        'range': {
-                            'startIndex': current_index + text_pos,
-                            'endIndex': current_index + text_pos + len(code_text)
-                        },
-                        'textStyle': {
-                            'weightedFontFamily': {'fontFamily': 'Courier New'},
-                            'backgroundColor': {
-                                'color': {
-                                    'rgbColor': {'red': 0.95, 'green': 0.95, 'blue': 0.95}
-                                }
-                            }
-                        },
-                        'fields': 'weightedFontFamily,backgroundColor'
-                    }
-                })
+                requests.append(_style_request(
+                    current_index + text_pos,
+                    current_index + text_pos + len(code_text),
+                    _STYLE_CODE[0], _STYLE_CODE[1]
+                ))
 
         # 2) Process bold text (**text**)
         for bold_match in self.bold_pattern.finditer(markdown_text):
@@ -621,45 +801,25 @@ class MarkdownFormatter:
             text_pos = cleaned_text.find(bold_text)
             if text_pos >= 0:
                 # Apply bold formatting
-                requests.append({
-                    'updateTextStyle': {
-                        'range': {
-                            'startIndex': current_index + text_pos,
-                            'endIndex': current_index + text_pos + len(bold_text)
-                        },
-                        'textStyle': {
-                            'bold': True
-                        },
-                        'fields': 'bold'
-                    }
-                })
+                requests.append(_style_request(
+                    current_index + text_pos,
+                    current_index + text_pos + len(bold_text),
+                    _STYLE_BOLD[0], _STYLE_BOLD[1]
+                ))
 
         # 3) Process italic text (*text*), skipping those inside bold
+        inside_bold = _bold_containment(markdown_text)
         for italic_match in self.italic_pattern.finditer(markdown_text):
             italic_text = italic_match.group(1)
-            # Skip if it's inside a bold region
-            is_inside_bold = False
-            for bold_match in self.bold_pattern.finditer(markdown_text):
-                if (bold_match.start() <= italic_match.start() and
-                        bold_match.end() >= italic_match.end()):
-                    is_inside_bold = True
-                    break
-            if not is_inside_bold:
+            if not inside_bold(italic_match.start(), italic_match.end()):
                 text_pos = cleaned_text.find(italic_text)
                 if text_pos >= 0:
                     # Apply italic formatting
-                    requests.append({
-                        'updateTextStyle': {
-                            'range': {
-                                'startIndex': current_index + text_pos,
-                                'endIndex': current_index + text_pos + len(italic_text)
-                            },
-                            'textStyle': {
-                                'italic': True
-                            },
-                            'fields': 'italic'
-                        }
-                    })
+                    requests.append(_style_request(
+                        current_index + text_pos,
+                        current_index + text_pos + len(italic_text),
+                        _STYLE_ITALIC[0], _STYLE_ITALIC[1]
+                    ))
 
         # 4) Process links ([text](url))
         for link_match in self.link_pattern.finditer(markdown_text):
@@ -670,17 +830,8 @@ class MarkdownFormatter:
             text_pos = cleaned_text.find(link_text)
             if text_pos >= 0:
                 # Apply link style
-                requests.append({
-                    'updateTextStyle': {
-                        'range': {
-                            'startIndex': current_index + text_pos,
-                            'endIndex': current_index + text_pos + len(link_text)
-                        },
-                        'textStyle': {
-                            'link': {
-                                'url': url
-                            }
-                        },
-                        'fields': 'link'
-                    }
-                })
\ No newline at end of file
+                requests.append(_style_request(
+                    current_index + text_pos,
+                    current_index + text_pos + len(link_text),
+                    {'link': {'url': url}}, _LINK_FIELDS
+                ))
\ No newline at end of file
@@ -0,0 +1,26 @@
+from enum import Enum
+
+
+class BulletPreset(str, Enum):
+    """
+    Glyph presets accepted by createParagraphBullets' bulletPreset field.
+
+    Members subclass str, so they serialize directly into request bodies
+    and compare equal to the raw API constant strings.
+    """
+
+    DISC_CIRCLE_SQUARE = "BULLET_DISC_CIRCLE_SQUARE"
+    DIAMONDX_ARROW3D_SQUARE = "BULLET_DIAMONDX_ARROW3D_SQUARE"
+    CHECKBOX = "BULLET_CHECKBOX"
+    ARROW_DIAMOND_DISC = "BULLET_ARROW_DIAMOND_DISC"
+    STAR_CIRCLE_SQUARE = "BULLET_STAR_CIRCLE_SQUARE"
+    ARROW3D_CIRCLE_SQUARE = "BULLET_ARROW3D_CIRCLE_SQUARE"
+    LEFTTRIANGLE_DIAMOND_DISC = "BULLET_LEFTTRIANGLE_DIAMOND_DISC"
+    DIAMONDX_HOLLOWDIAMOND_SQUARE = "BULLET_DIAMONDX_HOLLOWDIAMOND_SQUARE"
+    DIAMOND_CIRCLE_SQUARE = "BULLET_DIAMOND_CIRCLE_SQUARE"
+    NUMBERED_DECIMAL_ALPHA_ROMAN = "NUMBERED_DECIMAL_ALPHA_ROMAN"
+    NUMBERED_DECIMAL_ALPHA_ROMAN_PARENS = "NUMBERED_DECIMAL_ALPHA_ROMAN_PARENS"
+    NUMBERED_DECIMAL_NESTED = "NUMBERED_DECIMAL_NESTED"
+    NUMBERED_UPPERALPHA_ALPHA_ROMAN = "NUMBERED_UPPERALPHA_ALPHA_ROMAN"
+    NUMBERED_UPPERROMAN_UPPERALPHA_DECIMAL = "NUMBERED_UPPERROMAN_UPPERALPHA_DECIMAL"
+    NUMBERED_ZERODECIMAL_ALPHA_ROMAN = "NUMBERED_ZERODECIMAL_ALPHA_ROMAN"
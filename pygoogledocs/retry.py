@@ -0,0 +1,58 @@
+"""
+Retry support for transient Google API failures.
+
+Drive and Docs return HTTP 429 under bursty write loads (the per-user
+write quota is roughly 10/s) and occasional 5xx errors; without a retry
+policy a single transient failure kills a whole generation run.
+"""
+
+import random
+import time
+
+from googleapiclient.errors import HttpError
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_RETRY_MAX = 6
+DEFAULT_BASE_DELAY = 1.0
+MAX_DELAY_SECONDS = 32.0
+
+def execute_with_retry(request, retry_max=DEFAULT_RETRY_MAX, base_delay=DEFAULT_BASE_DELAY,
+                       http=None):
+    """
+    Execute a googleapiclient request, retrying transient failures.
+
+    Retries on 429/500/502/503/504 with exponential backoff capped at
+    MAX_DELAY_SECONDS plus jitter, honoring a Retry-After header when the
+    server provides one.
+
+    Args:
+        request: A googleapiclient request (anything with an execute method)
+        retry_max: Maximum number of retries before giving up
+        base_delay: Initial backoff delay in seconds
+        http: Transport to execute over instead of the service's shared
+            one; threaded callers pass a per-thread transport here
+
+    Returns:
+        The executed request's response
+    """
+    for attempt in range(retry_max + 1):
+        try:
+            return request.execute(http=http)
+        except HttpError as error:
+            status = error.resp.status
+            if status not in RETRYABLE_STATUS_CODES or attempt == retry_max:
+                raise
+
+            delay = None
+            retry_after = error.resp.get('retry-after')
+            if retry_after:
+                # Retry-After may also be an HTTP-date; fall back to the
+                # computed backoff rather than failing on it
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    delay = None
+            if delay is None:
+                delay = min(MAX_DELAY_SECONDS, base_delay * 2 ** attempt) + random.uniform(0, 1)
+            time.sleep(delay)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+"""
+Regenerate the bundled API discovery documents.
+
+Downloads the Docs v1 and Drive v3 discovery JSON into
+pygoogledocs/_discovery/ so installed packages can build services without
+a discovery HTTPS fetch. Run this when bumping an API version.
+"""
+
+import json
+import pathlib
+import urllib.request
+
+DISCOVERY_URLS = {
+    'docs_v1.json': 'https://docs.googleapis.com/$discovery/rest?version=v1',
+    'drive_v3.json': 'https://www.googleapis.com/discovery/v1/apis/drive/v3/rest',
+}
+
+TARGET_DIR = pathlib.Path(__file__).resolve().parent.parent / 'pygoogledocs' / '_discovery'
+
+def main():
+    for filename, url in DISCOVERY_URLS.items():
+        print(f"Fetching {url}")
+        with urllib.request.urlopen(url) as response:
+            document = json.load(response)
+        target = TARGET_DIR / filename
+        target.write_text(json.dumps(document, indent=2, sort_keys=True))
+        print(f"Wrote {target}")
+
+if __name__ == '__main__':
+    main()